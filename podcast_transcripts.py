@@ -7,292 +7,3351 @@ Note: Transcript availability varies by podcast and platform.
 
 import requests
 import json
+import codecs
 import time
 import os
 from urllib.parse import urlparse, parse_qs
 import re
 from datetime import datetime
 import ssl
+import gc
+import hashlib
+import shutil
+import sqlite3
+import subprocess
+import threading
+import queue
 import urllib.request
+import weakref
+from bisect import bisect_right
+from collections import OrderedDict
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.error import URLError
 
+class TranscriptionBackend:
+    """Interface for the speech-to-text engines behind AI transcription.
+
+    Backends load a model by size name and transcribe either an audio file
+    path or mono 16 kHz float32 samples, returning ``{"text": ...,
+    "segments": [{"start", "end", "text"}, ...]}`` with times in seconds.
+    """
+
+    name = None
+    package = None
+    install_hint = None
+
+    def available(self):
+        import importlib.util
+        return importlib.util.find_spec(self.package) is not None
+
+    def load_model(self, model_name):
+        raise NotImplementedError
+
+    def transcribe(self, model, audio):
+        raise NotImplementedError
+
+    def load_audio(self, path):
+        """Decode an audio file to mono 16 kHz float32 samples"""
+        raise NotImplementedError
+
+    def preload_hint(self, model_name):
+        """Command that downloads ``model_name`` outside of a run"""
+        raise NotImplementedError
+
+    def options(self):
+        """Settings that change the output, used in transcript cache keys"""
+        return {}
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """The reference openai-whisper (PyTorch) implementation"""
+
+    name = "openai-whisper"
+    package = "whisper"
+    install_hint = "pip install openai-whisper"
+
+    def load_model(self, model_name):
+        import whisper
+        return whisper.load_model(model_name)  # Options: tiny, base, small, medium, large
+
+    def transcribe(self, model, audio):
+        result = model.transcribe(audio)
+        segments = [{'start': seg['start'], 'end': seg['end'], 'text': seg['text']}
+                    for seg in result.get('segments', [])]
+        return {'text': result['text'], 'segments': segments}
+
+    def load_audio(self, path):
+        import whisper
+        return whisper.load_audio(path)
+
+    def preload_hint(self, model_name):
+        return f"python -c \"import whisper; whisper.load_model('{model_name}')\""
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """faster-whisper (CTranslate2), int8-quantized on CPU by default.
+
+    Typically several times faster than openai-whisper on CPU-only machines
+    for the same model size.
+    """
+
+    name = "faster-whisper"
+    package = "faster_whisper"
+    install_hint = "pip install faster-whisper"
+
+    def __init__(self, device="cpu", compute_type="int8", cpu_threads=0, beam_size=5):
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.beam_size = beam_size
+
+    def load_model(self, model_name):
+        from faster_whisper import WhisperModel
+        return WhisperModel(model_name, device=self.device, compute_type=self.compute_type,
+                            cpu_threads=self.cpu_threads)
+
+    def transcribe(self, model, audio):
+        segments, _ = model.transcribe(audio, beam_size=self.beam_size)
+        segments = [{'start': seg.start, 'end': seg.end, 'text': seg.text} for seg in segments]
+        return {'text': ''.join(seg['text'] for seg in segments), 'segments': segments}
+
+    def load_audio(self, path):
+        from faster_whisper import decode_audio
+        return decode_audio(path, sampling_rate=16000)
+
+    def preload_hint(self, model_name):
+        return (f"python -c \"from faster_whisper import WhisperModel; "
+                f"WhisperModel('{model_name}', compute_type='{self.compute_type}')\"")
+
+    def options(self):
+        return {'device': self.device, 'compute_type': self.compute_type, 'beam_size': self.beam_size}
+
+TRANSCRIPTION_BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+def get_transcription_backend(name="openai-whisper", **options):
+    """Instantiate a transcription backend by name (see TRANSCRIPTION_BACKENDS)"""
+    try:
+        return TRANSCRIPTION_BACKENDS[name](**options)
+    except KeyError:
+        raise ValueError(f"Unknown transcription backend '{name}'. "
+                         f"Choose from: {', '.join(TRANSCRIPTION_BACKENDS)}")
+
+class WhisperModelRegistry:
+    """Keeps loaded Whisper models resident between episodes.
+
+    Models are loaded lazily through ``backend`` on first use and cached by
+    size name. At most ``max_models`` sizes are held at once; requesting
+    another size evicts the least recently used one before the new one is
+    loaded, so memory stays bounded when switching sizes.
+
+    A model object must not run two transcriptions at once (openai-whisper
+    installs kv-cache hooks on the shared model while decoding), so callers
+    borrow a copy with ``checkout`` and hand it back with ``checkin``. Up to
+    ``copies_per_model`` copies of a size are loaded on demand, one per
+    concurrent caller; further callers wait for a copy to come back.
+    """
+
+    def __init__(self, max_models=1, backend=None, copies_per_model=1):
+        self.max_models = max(1, max_models)
+        self.backend = backend or OpenAIWhisperBackend()
+        self.copies_per_model = max(1, copies_per_model)
+        self._models = OrderedDict()
+        self._idle = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    def checkout(self, model_name):
+        """Borrow a copy of ``model_name`` for one transcription, loading it if needed"""
+        with self._available:
+            while True:
+                if model_name not in self._models:
+                    while len(self._models) >= self.max_models:
+                        evicted, _ = self._models.popitem(last=False)
+                        self._idle.pop(evicted, None)
+                        print(f"  Unloading Whisper model '{evicted}'")
+                        self._release_memory()
+                    self._models[model_name] = []
+                    self._idle[model_name] = []
+                
+                self._models.move_to_end(model_name)
+                if self._idle[model_name]:
+                    return self._idle[model_name].pop()
+                loading = self._loading.get(model_name, 0)
+                if len(self._models[model_name]) + loading < self.copies_per_model:
+                    self._loading[model_name] = loading + 1
+                    break
+                self._available.wait()
+
+        # Load outside the lock so borrowed copies can be returned meanwhile
+        try:
+            # Set environment variable to bypass SSL for model downloads
+            os.environ['CURL_CA_BUNDLE'] = ''
+            os.environ['REQUESTS_CA_BUNDLE'] = ''
+
+            print(f"  Loading {self.backend.name} model '{model_name}'...")
+            model = self.backend.load_model(model_name)
+        except BaseException:
+            with self._available:
+                self._loading[model_name] -= 1
+                if model_name in self._models and not self._models[model_name]:
+                    del self._models[model_name]
+                    del self._idle[model_name]
+                self._available.notify_all()
+            raise
+
+        with self._available:
+            self._loading[model_name] -= 1
+            if model_name in self._models:
+                self._models[model_name].append(model)
+        return model
+
+    def checkin(self, model_name, model):
+        """Return a copy borrowed with ``checkout``"""
+        with self._available:
+            # Copies of a size evicted meanwhile are simply dropped
+            if any(model is copy for copy in self._models.get(model_name, ())):
+                self._idle[model_name].append(model)
+            self._available.notify_all()
+
+    def unload(self, model_name=None):
+        """Unload one model, or every model when ``model_name`` is None"""
+        with self._available:
+            if model_name is None:
+                self._models.clear()
+                self._idle.clear()
+            elif self._models.pop(model_name, None) is None:
+                return
+            else:
+                self._idle.pop(model_name, None)
+            self._release_memory()
+            self._available.notify_all()
+
+    def loaded_models(self):
+        """Names of the currently resident models, least recently used first"""
+        with self._lock:
+            return list(self._models)
+
+    def _release_memory(self):
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+# Whisper works on mono 16 kHz audio
+WHISPER_SAMPLE_RATE = 16000
+
+def split_on_silence(samples, chunk_seconds=600, overlap_seconds=5, search_seconds=10,
+                     sample_rate=WHISPER_SAMPLE_RATE):
+    """Split decoded audio into overlapping windows cut at quiet points.
+
+    Each cut is placed at the lowest-energy 20 ms frame within
+    ``search_seconds`` of the nominal ``chunk_seconds`` boundary, and the next
+    window starts ``overlap_seconds`` before the cut so words spanning it are
+    heard by both windows. Returns a list of (start, end) sample offsets.
+    """
+    import numpy as np
+
+    total = len(samples)
+    chunk = int(chunk_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    search = int(search_seconds * sample_rate)
+    frame = int(0.02 * sample_rate)
+
+    windows = []
+    start = 0
+    while total - start > chunk + search:
+        target = start + chunk
+        region = samples[target - search:target + search]
+        frames = len(region) // frame
+        energy = np.square(region[:frames * frame].reshape(frames, frame)).mean(axis=1)
+        cut = target - search + int(np.argmin(energy)) * frame + frame // 2
+        windows.append((start, cut))
+        start = max(cut - overlap, start + 1)
+    windows.append((start, total))
+    return windows
+
+def detect_speech(samples, sample_rate=WHISPER_SAMPLE_RATE, frame_seconds=0.03,
+                  min_silence_seconds=1.0, min_speech_seconds=0.25, pad_seconds=0.25):
+    """Find speech regions in decoded audio, returned as (start, end) sample offsets.
+
+    Uses webrtcvad when it is installed (it tells speech from music better),
+    otherwise an energy detector with a threshold adapted to the episode's
+    noise floor. Pauses shorter than ``min_silence_seconds`` are kept, and
+    every region is padded so words are not clipped.
+    """
+    import numpy as np
+
+    frame = int(frame_seconds * sample_rate)
+    frames = len(samples) // frame
+    if frames == 0:
+        return [(0, len(samples))] if len(samples) else []
+
+    try:
+        import webrtcvad
+        vad = webrtcvad.Vad(2)
+        pcm = (np.clip(samples[:frames * frame], -1, 1) * 32767).astype(np.int16).tobytes()
+        step = frame * 2
+        is_speech = np.array([vad.is_speech(pcm[i * step:(i + 1) * step], sample_rate)
+                              for i in range(frames)])
+    except ImportError:
+        rms = np.sqrt(np.square(samples[:frames * frame].reshape(frames, frame)).mean(axis=1))
+        db = 20 * np.log10(rms + 1e-10)
+        noise_floor = np.percentile(db, 10)
+        speech_level = np.percentile(db, 90)
+        threshold = min(max(noise_floor + 12, -55), speech_level - 20)
+        is_speech = db > threshold
+
+    regions = []
+    start = None
+    for i, speech in enumerate(is_speech):
+        if speech and start is None:
+            start = i
+        elif not speech and start is not None:
+            regions.append([start, i])
+            start = None
+    if start is not None:
+        regions.append([start, frames])
+
+    merged = []
+    for region in regions:
+        if merged and (region[0] - merged[-1][1]) * frame_seconds < min_silence_seconds:
+            merged[-1][1] = region[1]
+        else:
+            merged.append(region)
+
+    pad = int(pad_seconds * sample_rate)
+    return [(max(0, s * frame - pad), min(len(samples), e * frame + pad))
+            for s, e in merged if (e - s) * frame_seconds >= min_speech_seconds]
+
+class SpeechMap:
+    """Maps times in VAD-compressed audio back to the original recording"""
+
+    def __init__(self, regions, sample_rate=WHISPER_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.regions = []
+        self._offsets = []
+        offset = 0
+        for start, end in regions:
+            # Padding can make neighbouring regions overlap
+            if self.regions and start < self.regions[-1][1]:
+                start = self.regions[-1][1]
+            if end <= start:
+                continue
+            self.regions.append((start, end))
+            self._offsets.append(offset)
+            offset += end - start
+        self.length = offset
+
+    def compress(self, samples):
+        import numpy as np
+        return np.concatenate([samples[start:end] for start, end in self.regions])
+
+    def to_original(self, seconds):
+        """Original-recording time for a time in the compressed audio"""
+        if not self.regions:
+            return seconds
+        position = seconds * self.sample_rate
+        index = max(0, bisect_right(self._offsets, position) - 1)
+        start, end = self.regions[index]
+        return min(start + position - self._offsets[index], end) / self.sample_rate
+
+    def remap_segments(self, segments):
+        return [dict(segment, start=self.to_original(segment['start']), end=self.to_original(segment['end']))
+                for segment in segments]
+
+def remove_non_speech(samples, sample_rate=WHISPER_SAMPLE_RATE):
+    """Drop non-speech audio; returns (compressed samples, SpeechMap)"""
+    speech_map = SpeechMap(detect_speech(samples, sample_rate), sample_rate)
+    if not speech_map.regions:
+        return samples[:0], speech_map
+    return speech_map.compress(samples), speech_map
+
+def _normalize_word(word):
+    return re.sub(r'[^\w]', '', word.lower())
+
+def stitch_transcripts(texts, max_overlap_words=60, min_match_words=3):
+    """Join chunk transcripts, removing text repeated in overlapping windows.
+
+    The tail of the text so far and the head of the next chunk are aligned on
+    their longest common run of (normalized) words; the text is joined at the
+    start of that run, which also drops words clipped at the window edges.
+    Chunks with no sufficiently long match are simply concatenated.
+    """
+    words = []
+    for text in texts:
+        new_words = text.split()
+        tail = [_normalize_word(w) for w in words[-max_overlap_words:]]
+        head = [_normalize_word(w) for w in new_words[:max_overlap_words]]
+
+        # Longest common substring over words (tiny, so plain DP is fine)
+        best_length, best_tail_end, best_head_end = 0, 0, 0
+        previous = [0] * (len(head) + 1)
+        for i in range(1, len(tail) + 1):
+            current = [0] * (len(head) + 1)
+            for j in range(1, len(head) + 1):
+                if tail[i - 1] and tail[i - 1] == head[j - 1]:
+                    current[j] = previous[j - 1] + 1
+                    if current[j] > best_length:
+                        best_length, best_tail_end, best_head_end = current[j], i, j
+            previous = current
+
+        if best_length >= min_match_words:
+            keep = len(words) - len(tail) + best_tail_end - best_length
+            words = words[:keep] + new_words[best_head_end - best_length:]
+        else:
+            words.extend(new_words)
+    return ' '.join(words)
+
+# Publisher transcript formats (podcast:transcript), most useful first
+TRANSCRIPT_TYPE_PREFERENCE = ['text', 'vtt', 'srt', 'json', 'html']
+
+def transcript_format(mime_type, url=''):
+    """Map a podcast:transcript MIME type (or file extension) to a short format name"""
+    mime_type = (mime_type or '').split(';')[0].strip().lower()
+    formats = {
+        'text/plain': 'text',
+        'text/vtt': 'vtt',
+        'application/srt': 'srt',
+        'application/x-subrip': 'srt',
+        'text/srt': 'srt',
+        'application/json': 'json',
+        'text/html': 'html',
+    }
+    if mime_type in formats:
+        return formats[mime_type]
+    extension = os.path.splitext(urlparse(url).path)[1].lower()
+    return {'.txt': 'text', '.vtt': 'vtt', '.srt': 'srt', '.json': 'json',
+            '.html': 'html', '.htm': 'html'}.get(extension)
+
+def normalize_transcript(content, transcript_type):
+    """Turn an SRT, VTT, JSON, HTML or plain-text transcript into plain text"""
+    import html
+
+    if transcript_type == 'json':
+        data = json.loads(content)
+        segments = data.get('segments', []) if isinstance(data, dict) else data
+        paragraphs = []
+        speaker = None
+        for segment in segments:
+            body = (segment.get('body') or '').strip()
+            if not body:
+                continue
+            if not paragraphs or (segment.get('speaker') and segment['speaker'] != speaker):
+                speaker = segment.get('speaker')
+                paragraphs.append(f"{speaker}: {body}" if speaker else body)
+            else:
+                paragraphs[-1] += f" {body}"
+        return '\n'.join(paragraphs)
+
+    if transcript_type in ('srt', 'vtt'):
+        lines = []
+        # Cues are separated by blank lines. The header and NOTE/STYLE/REGION
+        # blocks carry no caption text, and whatever precedes a cue's timing
+        # line is its (numeric or named) identifier.
+        for block in re.split(r'\n\s*\n', content.lstrip('\ufeff').strip()):
+            block_lines = [line.strip() for line in block.splitlines() if line.strip()]
+            if not block_lines or re.match(r'(WEBVTT|NOTE|STYLE|REGION)\b', block_lines[0]):
+                continue
+            for i, line in enumerate(block_lines):
+                if '-->' in line:
+                    block_lines = block_lines[i + 1:]
+                    break
+            for line in block_lines:
+                line = html.unescape(re.sub(r'<[^>]+>', '', line)).strip()
+                # Rolling captions repeat the previous cue's text
+                if line and (not lines or lines[-1] != line):
+                    lines.append(line)
+        return ' '.join(lines)
+
+    if transcript_type == 'html':
+        content = re.sub(r'(?is)<(script|style)[^>]*>.*?</\1>', '', content)
+        content = re.sub(r'(?i)<br\s*/?>|</p>', '\n', content)
+        return html.unescape(re.sub(r'<[^>]+>', '', content)).strip()
+
+    return content.strip()
+
+def transcript_format_from_response(response, url=''):
+    """Guess a transcript's format from the response Content-Type or URL"""
+    return transcript_format(response.headers.get('Content-Type'), url) or 'text'
+
+def collect_feed_transcripts(content):
+    """Return the podcast:transcript tags of every item, in document order
+
+    feedparser keeps only the last ``podcast:transcript`` of an item, so the
+    raw document is scanned once more to collect all of them. Returns a list
+    with one list of transcript dicts per item, or None if the XML can't be
+    read that way.
+    """
+    import io
+    import xml.etree.ElementTree as ET
+
+    items = []
+    current = None
+    try:
+        for event, element in ET.iterparse(io.BytesIO(content), events=('start', 'end')):
+            tag = element.tag.rsplit('}', 1)[-1]
+            is_item = tag == 'item' or element.tag == '{http://www.w3.org/2005/Atom}entry'
+            if event == 'start':
+                if is_item:
+                    current = []
+                continue
+            if tag == 'transcript' and 'podcast' in element.tag.lower() and current is not None:
+                current.append({
+                    'url': element.get('url'),
+                    'type': element.get('type'),
+                    'language': element.get('language'),
+                    'rel': element.get('rel'),
+                })
+            elif is_item:
+                items.append(current)
+                current = None
+                element.clear()
+    except ET.ParseError:
+        return None
+    return items
+
+def iter_feed_items(chunks):
+    """Incrementally parse an RSS/Atom document and yield one dict per item
+
+    ``chunks`` is any iterable of bytes, typically a streaming response. Each
+    item is yielded as soon as its closing tag has been read and is then
+    dropped from the tree, so memory stays flat however long the feed is.
+    The dicts carry guid, title, link, published, description, audio_url and
+    the item's podcast:transcript tags. Raises ``ParseError`` on broken XML.
+    """
+    import xml.etree.ElementTree as ET
+
+    atom = '{http://www.w3.org/2005/Atom}'
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    stack = []
+
+    def text(element):
+        return ''.join(element.itertext()).strip() if element is not None else ''
+
+    def build(element):
+        item = {'guid': '', 'title': '', 'link': '', 'published': '', 'description': '',
+                'audio_url': None, 'transcripts': []}
+        for child in element:
+            tag = child.tag.rsplit('}', 1)[-1]
+            if tag in ('guid', 'id'):
+                item['guid'] = text(child)
+            elif tag == 'title' and not item['title']:
+                item['title'] = text(child)
+            elif tag == 'link':
+                rel = child.get('rel', 'alternate')
+                if child.get('href') and rel == 'enclosure' and not item['audio_url']:
+                    item['audio_url'] = child.get('href')
+                elif child.get('href') and rel == 'alternate':
+                    item['link'] = child.get('href')
+                elif not child.get('href'):
+                    item['link'] = text(child)
+            elif tag in ('pubDate', 'published') or (tag == 'updated' and not item['published']):
+                item['published'] = text(child)
+            elif tag in ('description', 'summary') and not item['description']:
+                item['description'] = text(child)
+            elif tag == 'enclosure' and not item['audio_url']:
+                item['audio_url'] = child.get('url')
+            elif tag == 'transcript' and 'podcast' in child.tag.lower():
+                item['transcripts'].append({
+                    'url': child.get('url'),
+                    'type': child.get('type'),
+                    'language': child.get('language'),
+                    'rel': child.get('rel'),
+                })
+        item['title'] = item['title'] or 'Unknown Episode'
+        return item
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == 'start':
+                stack.append(element)
+                continue
+            stack.pop()
+            if element.tag.rsplit('}', 1)[-1] == 'item' or element.tag == atom + 'entry':
+                item = build(element)
+                # Detach the finished item so the tree never grows
+                element.clear()
+                if stack:
+                    stack[-1].remove(element)
+                yield item
+    parser.close()
+
+def published_timestamp(published):
+    """Parse an RSS (RFC 822) or Atom (ISO 8601) date to a POSIX timestamp, or None"""
+    from email.utils import parsedate_to_datetime
+
+    if not published:
+        return None
+    try:
+        parsed = parsedate_to_datetime(published)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(published.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return parsed.timestamp()
+
+class TranscriptHTMLParser(HTMLParser):
+    """Single-pass, incremental scanner for transcripts embedded in episode pages.
+
+    Feed the page in chunks with ``feed``; ``transcript`` is set as soon as
+    either a JSON-LD block carrying a ``transcript`` or a transcript container
+    (``div``/``section`` whose class contains "transcript", or
+    ``id="transcript"``) has been read completely, so callers can stop
+    reading the response. Nested elements inside a container are tracked, so
+    the first inner ``</div>`` does not end it.
+
+    With ``head_only`` the scan also ends at ``</head>`` (or the first body
+    tag), for pages that only ever publish transcripts as JSON-LD in the head.
+    """
+
+    CONTAINER_TAGS = ('div', 'section')
+    BREAK_TAGS = ('br', 'p', 'div', 'li', 'section')
+
+    def __init__(self, head_only=False):
+        super().__init__()
+        self.head_only = head_only
+        self.head_finished = False
+        self.transcript = None
+        self._json_ld = None
+        self._container_tag = None
+        self._container_depth = 0
+        self._container_text = []
+        self._skip_depth = 0
+
+    @property
+    def done(self):
+        return self.transcript is not None or (self.head_only and self.head_finished)
+
+    @property
+    def in_container(self):
+        """True while a transcript container is open but not yet complete"""
+        return self._container_tag is not None
+
+    def _is_container(self, tag, attrs):
+        if tag not in self.CONTAINER_TAGS:
+            return False
+        attrs = dict(attrs)
+        return ('transcript' in (attrs.get('class') or '').lower()
+                or (tag == 'div' and (attrs.get('id') or '').lower() == 'transcript'))
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'body':
+            self.head_finished = True
+        if tag == 'script' and (dict(attrs).get('type') or '').lower() == 'application/ld+json':
+            self._json_ld = []
+            return
+        if self._container_tag is None:
+            if self._is_container(tag, attrs):
+                self._container_tag = tag
+                self._container_depth = 1
+                self._container_text = []
+            return
+        
+        if tag == self._container_tag:
+            self._container_depth += 1
+        if tag in ('script', 'style'):
+            self._skip_depth += 1
+        elif tag in self.BREAK_TAGS:
+            self._container_text.append('\n')
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == 'head':
+            self.head_finished = True
+        if tag == 'script' and self._json_ld is not None:
+            self._finish_json_ld(''.join(self._json_ld))
+            self._json_ld = None
+            return
+        if self._container_tag is None:
+            return
+        
+        if tag in ('script', 'style'):
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == self._container_tag:
+            self._container_depth -= 1
+            if self._container_depth == 0:
+                text = ''.join(self._container_text).strip()
+                self._container_tag = None
+                self._container_text = []
+                # Empty containers (e.g. a "Show transcript" toggle) don't count
+                if text:
+                    self.transcript = re.sub(r'\n\s*\n+', '\n\n', text)
+
+    def handle_data(self, data):
+        if self.done:
+            return
+        if self._json_ld is not None:
+            self._json_ld.append(data)
+        elif self._container_tag is not None and not self._skip_depth:
+            self._container_text.append(data)
+
+    def _finish_json_ld(self, raw):
+        try:
+            ld_data = json.loads(raw)
+        except ValueError:
+            return
+        
+        candidates = ld_data if isinstance(ld_data, list) else [ld_data]
+        for item in candidates:
+            if not isinstance(item, dict):
+                continue
+            graph = item.get('@graph') or []
+            candidates.extend(graph if isinstance(graph, list) else [graph])
+            transcript = item.get('transcript')
+            if isinstance(transcript, dict):
+                transcript = transcript.get('text')
+            # Only text counts; lists or numbers would break saving the file
+            if isinstance(transcript, str) and transcript.strip():
+                self.transcript = transcript.strip()
+                return
+
+_chunk_worker_backend = None
+_chunk_worker_model = None
+
+def _chunk_worker_init(backend, model_name):
+    """Process pool initializer: load one model per worker process"""
+    global _chunk_worker_backend, _chunk_worker_model
+    _chunk_worker_backend = backend
+    _chunk_worker_model = backend.load_model(model_name)
+
+def _chunk_worker_transcribe(samples):
+    return _chunk_worker_backend.transcribe(_chunk_worker_model, samples)
+
+class HostRateLimiter:
+    """Token-bucket rate limiting per host.
+
+    Each host gets its own bucket refilled at ``rate`` requests per second and
+    holding up to ``burst`` tokens, so requests to unrelated hosts (iTunes,
+    publisher sites, audio CDNs) never wait on each other. ``host_limits`` maps
+    a host name to a ``(rate, burst)`` pair overriding the defaults. A host can
+    be paused with ``penalize`` when it answers 429 / Retry-After.
+    """
+
+    def __init__(self, rate=1.0, burst=3, host_limits=None):
+        self.rate = rate
+        self.burst = burst
+        self.host_limits = dict(host_limits or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _limits(self, host):
+        return self.host_limits.get(host, (self.rate, self.burst))
+
+    def _reserve(self, host):
+        """Take a token for ``host`` and return how long the caller must wait"""
+        rate, burst = self._limits(host)
+        if not rate or rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated, blocked_until = self._buckets.get(host, (burst, now, 0.0))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            # Tokens may go negative: each waiting caller reserves a future slot
+            wait = max(0.0, (1 - tokens) / rate, blocked_until - now)
+            self._buckets[host] = (tokens - 1, now, blocked_until)
+            return wait
+
+    def acquire(self, host):
+        """Block until a request to ``host`` is allowed"""
+        wait = self._reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, host):
+        """Async variant of acquire"""
+        import asyncio
+        wait = self._reserve(host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, host, delay):
+        """Stop issuing requests to ``host`` for ``delay`` seconds"""
+        rate, burst = self._limits(host)
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated, blocked_until = self._buckets.get(host, (burst, now, 0.0))
+            self._buckets[host] = (min(tokens, 0.0), now, max(blocked_until, now + delay))
+
+    @staticmethod
+    def retry_after(headers, default):
+        """Parse a Retry-After header (seconds or HTTP date) into seconds"""
+        value = headers.get('Retry-After')
+        if not value:
+            return default
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            from email.utils import parsedate_to_datetime
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return default
+
+class RateLimitedSession(requests.Session):
+    """requests.Session that applies a HostRateLimiter to every request.
+
+    The limiter is applied in ``send`` so each redirect hop is charged to the
+    host it actually goes to. 429 responses (and 503s carrying Retry-After)
+    pause the host and are retried up to ``max_retries`` times.
+    """
+
+    def __init__(self, rate_limiter, max_retries=3):
+        super().__init__()
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).hostname or ''
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(host)
+            response = super().send(request, **kwargs)
+            throttled = response.status_code == 429 or (
+                response.status_code == 503 and 'Retry-After' in response.headers)
+            if not throttled or attempt >= self.max_retries:
+                return response
+            
+            delay = HostRateLimiter.retry_after(response.headers, default=2 ** attempt)
+            print(f"  {host} is throttling requests, retrying in {delay:.0f}s")
+            self.rate_limiter.penalize(host, delay)
+            response.close()
+            attempt += 1
+
+def default_cache_dir():
+    """Per-user directory for HTTP, feed and audio caches"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'podcast_transcripts')
+
+def _atomic_write(path, data):
+    """Write bytes to ``path`` via a temp file so readers never see partial data"""
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+def _lock_file(path):
+    """Open ``path`` and block until this process holds an exclusive lock on it"""
+    f = open(path, 'a+b')
+    try:
+        try:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        except ImportError:
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    # LK_LOCK gives up after ten one-second retries
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+    except BaseException:
+        f.close()
+        raise
+    return f
+
+def _unlock_file(f):
+    """Release a lock taken with ``_lock_file``"""
+    try:
+        try:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        except ImportError:
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    finally:
+        f.close()
+
+class FeedCache:
+    """On-disk cache of RSS documents and their HTTP validators.
+
+    For every feed URL the ETag / Last-Modified of the last 200 response are
+    kept next to the raw feed body, so the next poll can be sent as a
+    conditional GET and a 304 answered from disk. The body is stored as
+    fetched rather than parsed: feedparser results of malformed feeds carry
+    an exception object that can't be pickled.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, feed_url):
+        key = hashlib.sha256(feed_url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.json", f"{base}.xml"
+
+    def conditional_headers(self, feed_url):
+        """If-None-Match / If-Modified-Since headers for a cached feed"""
+        meta_path, feed_path = self._paths(feed_url)
+        if not (os.path.exists(meta_path) and os.path.exists(feed_path)):
+            return {}
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def load(self, feed_url):
+        """Return the cached feed body, or None"""
+        _, feed_path = self._paths(feed_url)
+        try:
+            with open(feed_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, feed_url, headers, content):
+        """Cache a feed body with the validators from its response headers
+        
+        Failing to write the cache only costs the next conditional GET, so
+        errors are reported and otherwise ignored.
+        """
+        meta = self._meta(feed_url, headers)
+        if meta is None:
+            return
+        
+        meta_path, feed_path = self._paths(feed_url)
+        try:
+            _atomic_write(feed_path, content)
+            _atomic_write(meta_path, meta)
+        except OSError as e:
+            print(f"Could not cache RSS feed: {e}")
+
+    def tee(self, feed_url, headers, chunks):
+        """Yield ``chunks`` unchanged while writing them to the cache
+        
+        Used for streamed feeds. The body only replaces the cached copy once
+        ``chunks`` has been read to the end; if the consumer stops early, the
+        stream fails or a write fails, the previous entry is left as it was.
+        """
+        meta = self._meta(feed_url, headers)
+        if meta is None:
+            yield from chunks
+            return
+        
+        meta_path, feed_path = self._paths(feed_url)
+        temp_path = f"{feed_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        f = None
+        try:
+            try:
+                f = open(temp_path, 'wb')
+            except OSError as e:
+                print(f"Could not cache RSS feed: {e}")
+            for chunk in chunks:
+                if f is not None:
+                    try:
+                        f.write(chunk)
+                    except OSError as e:
+                        print(f"Could not cache RSS feed: {e}")
+                        f.close()
+                        f = None
+                yield chunk
+            if f is not None:
+                try:
+                    f.close()
+                    os.replace(temp_path, feed_path)
+                    _atomic_write(meta_path, meta)
+                except OSError as e:
+                    print(f"Could not cache RSS feed: {e}")
+        finally:
+            if f is not None:
+                f.close()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _meta(self, feed_url, headers):
+        """Serialized validators of a response, or None if it has none"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            # Nothing to revalidate against, so a cached copy is never usable
+            return None
+        meta = {'url': feed_url, 'etag': etag, 'last_modified': last_modified, 'fetched_at': time.time()}
+        return json.dumps(meta).encode('utf-8')
+
+class RangeRequestError(Exception):
+    """The server did not honour a byte-range request"""
+
+class AudioCache:
+    """Content-addressed on-disk cache of downloaded audio enclosures.
+
+    Files are keyed by enclosure URL plus the ETag / Content-Length the server
+    reported, so a changed file gets a new key. Total size is capped at
+    ``max_bytes`` with least-recently-used eviction (access refreshes a
+    file's mtime). Files handed out by ``get``/``put`` are pinned until
+    ``release`` so eviction never removes audio that is being transcribed.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self._pins = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(audio_url, etag=None, length=None):
+        identity = f"{audio_url}\n{etag or ''}\n{length or ''}"
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def _path(self, key, audio_url):
+        extension = os.path.splitext(urlparse(audio_url).path)[1].lower()
+        if not re.fullmatch(r'\.[a-z0-9]{1,5}', extension):
+            extension = '.audio'
+        return os.path.join(self.cache_dir, key[:2], key + extension)
+
+    def temp_path(self, audio_url):
+        """Scratch file on the cache's filesystem, so ``put`` is a cheap rename"""
+        name = f"{self.key(audio_url)}.{os.getpid()}.{threading.get_ident()}.partial"
+        return os.path.join(self.cache_dir, name)
+
+    def owns(self, path):
+        return os.path.abspath(path).startswith(self.cache_dir + os.sep)
+
+    def get(self, audio_url, etag=None, length=None):
+        """Return the cached (and now pinned) file, or None"""
+        path = self._path(self.key(audio_url, etag, length), audio_url)
+        with self._lock:
+            if not os.path.exists(path):
+                return None
+            os.utime(path)
+            self._pins[path] = self._pins.get(path, 0) + 1
+        return path
+
+    def put(self, audio_url, etag, length, source_path):
+        """Move a downloaded file into the cache; returns its pinned cache path"""
+        path = self._path(self.key(audio_url, etag, length), audio_url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.move(source_path, path)
+        with self._lock:
+            self._pins[path] = self._pins.get(path, 0) + 1
+        self.evict()
+        return path
+
+    def release(self, path):
+        """Unpin a file obtained from ``get`` or ``put``"""
+        with self._lock:
+            count = self._pins.get(path, 0) - 1
+            if count > 0:
+                self._pins[path] = count
+            else:
+                self._pins.pop(path, None)
+
+    def evict(self):
+        """Delete least recently used files until the cache fits in max_bytes"""
+        with self._lock:
+            files = []
+            total = 0
+            for directory, _, names in os.walk(self.cache_dir):
+                for name in names:
+                    if name.endswith('.partial'):
+                        continue
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+            
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                if path in self._pins:
+                    continue
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass
+
+class TranscriptCache:
+    """Transcription results keyed by audio content hash plus model settings.
+
+    Lets identical audio published under several feeds or URLs (syndicated
+    shows, re-runs, "best of" episodes) be transcribed only once, across runs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    key TEXT PRIMARY KEY,
+                    audio_hash TEXT NOT NULL,
+                    settings TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def audio_hash(audio):
+        """SHA-256 of an audio file's bytes, or of decoded samples"""
+        digest = hashlib.sha256()
+        if isinstance(audio, str):
+            with open(audio, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+        else:
+            import numpy as np
+            digest.update(b'pcm:')
+            digest.update(memoryview(np.ascontiguousarray(audio)).cast('B'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(audio_hash, settings):
+        return hashlib.sha256(f"{audio_hash}\n{json.dumps(settings, sort_keys=True)}".encode('utf-8')).hexdigest()
+
+    def get(self, audio_hash, settings):
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM transcripts WHERE key = ?",
+                                     (self.key(audio_hash, settings),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, audio_hash, settings, result):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (key, audio_hash, settings, result, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.key(audio_hash, settings), audio_hash, json.dumps(settings, sort_keys=True),
+                 json.dumps(result), time.time()))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class LookupCache:
+    """Persistent TTL cache for iTunes lookup results, keyed by podcast id.
+
+    Entries younger than ``ttl`` seconds are fresh. Entries older than that
+    but within ``ttl + stale_ttl`` are still served (stale-while-revalidate)
+    while the caller refreshes them in the background; anything older is
+    treated as a miss.
+    """
+
+    FRESH, STALE, MISS = 'fresh', 'stale', 'miss'
+
+    def __init__(self, path, ttl=7 * 24 * 3600, stale_ttl=30 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS lookups (
+                    podcast_id TEXT PRIMARY KEY,
+                    info TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+
+    def get(self, podcast_id):
+        """Return (state, info) where state is FRESH, STALE or MISS"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT info, fetched_at FROM lookups WHERE podcast_id = ?", (str(podcast_id),)).fetchone()
+        if row is None:
+            return self.MISS, None
+        
+        age = time.time() - row[1]
+        if age < self.ttl:
+            return self.FRESH, json.loads(row[0])
+        if age < self.ttl + self.stale_ttl:
+            return self.STALE, json.loads(row[0])
+        return self.MISS, None
+
+    def put(self, podcast_id, info):
+        self.put_many({podcast_id: info})
+
+    def put_many(self, infos):
+        """Store several ``podcast_id -> info`` results in one transaction"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO lookups (podcast_id, info, fetched_at) VALUES (?, ?, ?)",
+                [(str(podcast_id), json.dumps(info), now) for podcast_id, info in infos.items()])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class EpisodeStateStore:
+    """Persistent per-episode progress, stored as SQLite in the output directory.
+
+    Episodes are keyed by GUID (falling back to the enclosure URL, page link or
+    title) and record their status, the hash of the saved transcript and its
+    output path, so a restarted run can skip completed work without touching
+    the network and only retry new or failed episodes. Per feed it also keeps
+    a high-water mark (GUID and pubDate of the newest episode seen) for
+    incremental syncs.
+    """
+
+    FILENAME = ".transcript_state.sqlite3"
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS episodes (
+                    key TEXT PRIMARY KEY,
+                    title TEXT,
+                    status TEXT NOT NULL,
+                    content_hash TEXT,
+                    output_path TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS feeds (
+                    feed_url TEXT PRIMARY KEY,
+                    guid TEXT,
+                    published TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def episode_key(episode_data):
+        """Stable identifier for an episode across runs
+        
+        Batch runs keep every show in one store, and shows reuse GUIDs like
+        "1" or titles like "Episode 1", so episodes tagged with the
+        ``feed_url`` they came from are keyed by feed as well.
+        """
+        for field in ('guid', 'audio_url', 'link', 'title'):
+            if episode_data.get(field):
+                feed_url = episode_data.get('feed_url')
+                return f"{feed_url} {episode_data[field]}" if feed_url else episode_data[field]
+        return None
+
+    @staticmethod
+    def file_hash(path):
+        """SHA-256 of a saved transcript file"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the stored record for ``key`` as a dict, or None"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT key, title, status, content_hash, output_path, error, attempts, updated_at "
+                "FROM episodes WHERE key = ?", (key,))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        columns = ('key', 'title', 'status', 'content_hash', 'output_path', 'error', 'attempts', 'updated_at')
+        return dict(zip(columns, row))
+
+    def is_complete(self, key):
+        """True when the episode was transcribed and its output file still exists"""
+        record = self.get(key)
+        return bool(record and record['status'] == 'done'
+                    and record['output_path'] and os.path.exists(record['output_path']))
+
+    def mark(self, key, status, title=None, content_hash=None, output_path=None, error=None):
+        """Record the outcome of processing an episode"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO episodes (key, title, status, content_hash, output_path, error, attempts, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    title = excluded.title,
+                    status = excluded.status,
+                    content_hash = excluded.content_hash,
+                    output_path = excluded.output_path,
+                    error = excluded.error,
+                    attempts = episodes.attempts + 1,
+                    updated_at = excluded.updated_at
+            """, (key, title, status, content_hash, output_path, error, time.time()))
+
+    def high_water_mark(self, feed_url):
+        """Return {'guid', 'published'} of the newest episode synced from ``feed_url``, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT guid, published FROM feeds WHERE feed_url = ?", (feed_url,)).fetchone()
+        if row is None:
+            return None
+        return {'guid': row[0], 'published': row[1]}
+
+    def set_high_water_mark(self, feed_url, guid, published):
+        """Remember the newest episode of ``feed_url`` for the next incremental sync"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO feeds (feed_url, guid, published, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(feed_url) DO UPDATE SET
+                    guid = excluded.guid,
+                    published = excluded.published,
+                    updated_at = excluded.updated_at
+            """, (feed_url, guid, published, time.time()))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class EpisodeScheduler:
+    """Priority queue deciding which episode the pipeline works on next.
+
+    ``priority`` is a sequence of criteria applied in order: ``"cheap"``
+    (episodes with transcripts published in the feed before ones that need
+    scraping or Whisper), ``"newest"`` / ``"oldest"`` (by pubDate) and
+    ``"feed"`` (feed order, always the final tie-breaker). With
+    ``whisper_last`` audio downloads and transcriptions are queued behind
+    all text-only work in the lookahead window, and only start while the
+    total transcription time stays under ``cpu_budget`` seconds and
+    ``deadline`` seconds (counted from ``start``) haven't passed; the rest
+    are deferred to a later run. The budget is checked right before each
+    transcription starts (and before its audio is downloaded), so only the
+    transcriptions already running can overshoot it.
+
+    At most ``lookahead`` episodes are read ahead of the pipeline, so
+    streamed feeds keep flat memory.
+    """
+
+    CRITERIA = ('cheap', 'newest', 'oldest', 'feed')
+    # Returned by the transcription stage for jobs refused by the budget
+    DEFERRED = object()
+
+    def __init__(self, priority=('cheap', 'newest'), whisper_last=True, cpu_budget=None,
+                 deadline=None, lookahead=1000):
+        unknown = [criterion for criterion in priority if criterion not in self.CRITERIA]
+        if unknown:
+            raise ValueError(f"Unknown priority {unknown[0]!r}; choose from {', '.join(self.CRITERIA)}")
+        self.priority = tuple(priority)
+        self.whisper_last = whisper_last
+        self.cpu_budget = cpu_budget
+        self.deadline = deadline
+        self.lookahead = max(1, lookahead)
+        self._heap = []
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._spent = 0.0
+        self._deadline_at = None
+
+    def start(self):
+        """Start the deadline clock"""
+        if self.deadline is not None:
+            self._deadline_at = time.monotonic() + self.deadline
+
+    def _key(self, episode_data, whisper):
+        key = [1 if whisper else 0]
+        for criterion in self.priority:
+            if criterion == 'cheap':
+                key.append(0 if episode_data.get('transcripts') else 1)
+            elif criterion in ('newest', 'oldest'):
+                published = published_timestamp(episode_data.get('published'))
+                if published is None:
+                    key.append(float('inf'))
+                else:
+                    key.append(-published if criterion == 'newest' else published)
+        return key
+
+    def push(self, episode_data, whisper=False):
+        """Queue an episode; ``whisper`` marks its audio/transcription job"""
+        import heapq
+
+        self._counter += 1
+        heapq.heappush(self._heap, (self._key(episode_data, whisper), self._counter, episode_data, whisper))
+
+    def fill(self, episodes):
+        """Read from the ``episodes`` iterator up to the lookahead; False once it's exhausted"""
+        while len(self._heap) < self.lookahead:
+            episode_data = next(episodes, None)
+            if episode_data is None:
+                return False
+            self.push(episode_data)
+        return True
+
+    def pop(self):
+        """Return the next (episode_data, whisper) job, or None when empty"""
+        import heapq
+
+        if not self._heap:
+            return None
+        _, _, episode_data, whisper = heapq.heappop(self._heap)
+        return episode_data, whisper
+
+    def charge(self, seconds):
+        """Add the duration of a finished transcription to the budget"""
+        with self._lock:
+            self._spent += seconds
+
+    def whisper_allowed(self):
+        """True while another transcription fits the CPU budget and deadline"""
+        with self._lock:
+            if self.cpu_budget is not None and self._spent >= self.cpu_budget:
+                return False
+        return self._deadline_at is None or time.monotonic() < self._deadline_at
+
+class JobQueue:
+    """Interface of the episode job queues used by distributed worker mode.
+
+    A coordinator ``put``s episode jobs (JSON-serializable dicts; a ``key``
+    entry de-duplicates them) and workers ``claim`` them with a lease of
+    ``lease_seconds``. Workers extend the lease with ``heartbeat`` while they
+    work and finish with ``complete`` or ``fail``. A job whose lease runs out
+    (its worker crashed or hung) is handed to the next claimer, until it has
+    been attempted ``max_attempts`` times.
+    """
+
+    def __init__(self, max_attempts=3):
+        self.max_attempts = max_attempts
+
+    def put_many(self, jobs):
+        """Enqueue jobs, skipping keys already queued; returns how many were added"""
+        raise NotImplementedError
+
+    def put(self, job):
+        return self.put_many([job]) == 1
+
+    def claim(self, worker_id, lease_seconds=300):
+        """Lease the next job to ``worker_id``; returns (job_id, job) or None"""
+        raise NotImplementedError
+
+    def heartbeat(self, job_id, worker_id, lease_seconds=300):
+        """Extend a lease; False if the worker no longer holds it"""
+        raise NotImplementedError
+
+    def complete(self, job_id, worker_id):
+        """Mark a job done; False (and no change) if ``worker_id`` no longer holds it"""
+        raise NotImplementedError
+
+    def fail(self, job_id, worker_id, error, retry=True):
+        """Record a failure; with ``retry`` the job is queued again while attempts remain
+
+        Like ``complete``, only the worker holding the job can fail it.
+        """
+        raise NotImplementedError
+
+    def counts(self):
+        """Number of jobs per status (pending, claimed, done, failed)"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue in a SQLite file, shared by the workers on one host.
+
+    The file is opened in WAL mode, which relies on shared memory and does
+    not work over network filesystems; workers on several hosts need the
+    Redis queue instead.
+    """
+
+    def __init__(self, path, max_attempts=3):
+        super().__init__(max_attempts)
+        self.path = path
+        self._lock = threading.Lock()
+        # Autocommit mode so claims can take the write lock up front
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_key TEXT UNIQUE,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                worker TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+
+    def put_many(self, jobs):
+        now = time.time()
+        rows = [(job.get('key'), json.dumps(job), now) for job in jobs]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (job_key, payload, status, updated_at) VALUES (?, ?, 'pending', ?)",
+                rows)
+            self._conn.execute("COMMIT")
+            return self._conn.total_changes - before
+
+    def claim(self, worker_id, lease_seconds=300):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs that keep outliving their leases are given up on
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'lease expired', updated_at = ? "
+                    "WHERE status = 'claimed' AND lease_until < ? AND attempts >= ?",
+                    (now, now, self.max_attempts))
+                row = self._conn.execute(
+                    "SELECT id, payload FROM jobs "
+                    "WHERE status = 'pending' OR (status = 'claimed' AND lease_until < ?) "
+                    "ORDER BY id LIMIT 1", (now,)).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'claimed', worker = ?, lease_until = ?, "
+                        "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (worker_id, now + lease_seconds, now, row[0]))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def heartbeat(self, job_id, worker_id, lease_seconds=300):
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'claimed'",
+                (now + lease_seconds, now, job_id, worker_id))
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id):
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'done', lease_until = NULL, error = NULL, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'claimed'", (time.time(), job_id, worker_id))
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error, retry=True):
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN ? AND attempts < ? THEN 'pending' ELSE 'failed' END, "
+                "lease_until = NULL, error = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'claimed'",
+                (retry, self.max_attempts, error, time.time(), job_id, worker_id))
+            return cursor.rowcount == 1
+
+    def counts(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class RedisJobQueue(JobQueue):
+    """Job queue on a Redis-compatible server (``pip install redis``)
+
+    ``client`` is any object with the redis-py command API created with
+    ``decode_responses=True``, e.g. ``redis.Redis`` or ``fakeredis.FakeRedis``
+    for a local stand-in. Pending job ids live in a list, leases in a sorted
+    set scored by expiry, and payloads, owners and attempts in hashes under
+    ``prefix``. Every state change is a WATCH/MULTI transaction, so a worker
+    dying half-way never leaves a job neither pending nor leased, and a
+    worker whose lease was reclaimed can't touch the job any more.
+    """
+
+    def __init__(self, client, prefix="podcast_transcripts:jobs", max_attempts=3):
+        super().__init__(max_attempts)
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **options):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("redis not installed. Install with: pip install redis")
+        return cls(redis.Redis.from_url(url, decode_responses=True), **options)
+
+    def _key(self, name):
+        return f"{self.prefix}:{name}"
+
+    def _transaction(self, func, *names):
+        """Run ``func(pipe)`` with the given keys watched, retrying on conflicts"""
+        return self.client.transaction(func, *(self._key(name) for name in names),
+                                       value_from_callable=True)
+
+    def put_many(self, jobs):
+        added = 0
+        for job in jobs:
+            job_id = str(self.client.incr(self._key('seq')))
+
+            def put(pipe):
+                if job.get('key') and pipe.hexists(self._key('keys'), job['key']):
+                    return False
+                pipe.multi()
+                if job.get('key'):
+                    pipe.hset(self._key('keys'), job['key'], job_id)
+                pipe.hset(self._key('payload'), job_id, json.dumps(job))
+                pipe.rpush(self._key('pending'), job_id)
+                return True
+
+            added += self._transaction(put, 'keys')
+        return added
+
+    def _reclaim_expired(self, now):
+        """Requeue (or give up on) jobs whose lease has run out"""
+        for job_id in self.client.zrangebyscore(self._key('leases'), '-inf', now):
+            def reclaim(pipe):
+                score = pipe.zscore(self._key('leases'), job_id)
+                if score is None or score >= now:
+                    return
+                attempts = int(pipe.hget(self._key('attempts'), job_id) or 0)
+                pipe.multi()
+                pipe.zrem(self._key('leases'), job_id)
+                pipe.hdel(self._key('owner'), job_id)
+                if attempts >= self.max_attempts:
+                    pipe.hset(self._key('failed'), job_id, "lease expired")
+                else:
+                    pipe.rpush(self._key('pending'), job_id)
+
+            self._transaction(reclaim, 'leases')
+
+    def claim(self, worker_id, lease_seconds=300):
+        now = time.time()
+        self._reclaim_expired(now)
+
+        def claim(pipe):
+            job_id = pipe.lindex(self._key('pending'), 0)
+            if job_id is None:
+                return None
+            payload = pipe.hget(self._key('payload'), job_id)
+            # The pop and the lease are applied together or not at all
+            pipe.multi()
+            pipe.lpop(self._key('pending'))
+            pipe.zadd(self._key('leases'), {job_id: now + lease_seconds})
+            pipe.hset(self._key('owner'), job_id, worker_id)
+            pipe.hincrby(self._key('attempts'), job_id, 1)
+            return int(job_id), json.loads(payload)
+
+        return self._transaction(claim, 'pending')
+
+    def _if_owner(self, job_id, worker_id, apply):
+        """Apply ``apply(pipe, job_id)`` only while ``worker_id`` holds the job"""
+        job_id = str(job_id)
+
+        def guarded(pipe):
+            if pipe.hget(self._key('owner'), job_id) != worker_id:
+                return False
+            attempts = int(pipe.hget(self._key('attempts'), job_id) or 0)
+            pipe.multi()
+            apply(pipe, job_id, attempts)
+            return True
+
+        return self._transaction(guarded, 'owner')
+
+    def heartbeat(self, job_id, worker_id, lease_seconds=300):
+        def extend(pipe, job_id, attempts):
+            pipe.zadd(self._key('leases'), {job_id: time.time() + lease_seconds})
+
+        return self._if_owner(job_id, worker_id, extend)
+
+    def complete(self, job_id, worker_id):
+        def done(pipe, job_id, attempts):
+            pipe.zrem(self._key('leases'), job_id)
+            pipe.hdel(self._key('owner'), job_id)
+            pipe.hset(self._key('done'), job_id, time.time())
+
+        return self._if_owner(job_id, worker_id, done)
+
+    def fail(self, job_id, worker_id, error, retry=True):
+        def failed(pipe, job_id, attempts):
+            pipe.zrem(self._key('leases'), job_id)
+            pipe.hdel(self._key('owner'), job_id)
+            if retry and attempts < self.max_attempts:
+                pipe.rpush(self._key('pending'), job_id)
+            else:
+                pipe.hset(self._key('failed'), job_id, error)
+
+        return self._if_owner(job_id, worker_id, failed)
+
+    def counts(self):
+        return {
+            'pending': self.client.llen(self._key('pending')),
+            'claimed': self.client.zcard(self._key('leases')),
+            'done': self.client.hlen(self._key('done')),
+            'failed': self.client.hlen(self._key('failed')),
+        }
+
+JOB_QUEUES = {
+    'sqlite': SQLiteJobQueue,
+    'redis': RedisJobQueue,
+}
+
+def open_job_queue(url, **options):
+    """Open a job queue from ``redis://host:port/db`` or a SQLite path (``sqlite:///path`` also works)"""
+    scheme = urlparse(url).scheme
+    if scheme in ('redis', 'rediss', 'unix'):
+        return JOB_QUEUES['redis'].from_url(url, **options)
+    if url.startswith('sqlite:///'):
+        url = url[len('sqlite:///'):]
+    return JOB_QUEUES['sqlite'](url, **options)
+
 class PodcastTranscriptDownloader:
-    def __init__(self):
-        self.session = requests.Session()
+    # The iTunes lookup API allows roughly 20 requests per minute
+    DEFAULT_HOST_RATE_LIMITS = {'itunes.apple.com': (20 / 60, 3)}
+    # Ids per batched iTunes lookup request
+    LOOKUP_BATCH_SIZE = 200
+    # Audio download failures worth retrying; anything else fails straight away
+    RETRYABLE_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+    # Audio cache size unless audio_cache_bytes is given
+    DEFAULT_AUDIO_CACHE_BYTES = 2 * 1024 ** 3
+    
+    def __init__(self, whisper_model="base", max_loaded_models=1, async_connection_limit=100,
+                 requests_per_second=1.0, burst=3, host_rate_limits=None, cache_dir=None,
+                 lookup_ttl=7 * 24 * 3600, lookup_stale_ttl=30 * 24 * 3600, stream_audio=False,
+                 chunk_workers=0, chunk_seconds=600, chunk_overlap=5,
+                 max_page_bytes=5 * 1024 * 1024, page_scan_head_only=False,
+                 transcription_server=None, backend="openai-whisper", backend_options=None,
+                 vad=False, audio_cache_bytes=None,
+                 range_download_parts=4, range_download_threshold=16 * 1024 * 1024,
+                 download_buffer=1024 * 1024, download_retries=3):
+        self.whisper_model = whisper_model
+        
+        # Interrupted audio downloads are resumed up to download_retries times
+        self.download_retries = download_retries
+        # One download at a time per partial file: path -> [lock, users]
+        self._partial_locks = {}
+        self._partial_locks_lock = threading.Lock()
+        
+        # Enclosures of at least range_download_threshold bytes on servers that
+        # accept byte ranges are fetched as range_download_parts parallel ranges
+        self.range_download_parts = range_download_parts
+        self.range_download_threshold = range_download_threshold
+        self.download_buffer = download_buffer
+        
+        # Drop non-speech audio (silence, music beds) before transcription
+        self.vad = vad
+        
+        # Speech-to-text engine used for "Method 2" (see TRANSCRIPTION_BACKENDS)
+        if isinstance(backend, TranscriptionBackend):
+            self.backend = backend
+        else:
+            self.backend = get_transcription_backend(backend, **(backend_options or {}))
+        
+        # URL of a shared local transcription worker (see TranscriptionServer);
+        # when set, transcription jobs are sent there instead of loading a model
+        self.transcription_server = transcription_server.rstrip('/') if transcription_server else None
+        
+        # Episode page scanning: byte ceiling per page, and whether to stop
+        # at </head> once the JSON-LD there has been read
+        self.max_page_bytes = max_page_bytes
+        self.page_scan_head_only = page_scan_head_only
+        
+        # Long episodes are split into overlapping windows transcribed across
+        # a pool of chunk_workers processes (0 or 1 disables chunking)
+        self.chunk_workers = chunk_workers
+        self.chunk_seconds = chunk_seconds
+        self.chunk_overlap = chunk_overlap
+        self._chunk_pool = None
+        self._chunk_pool_model = None
+        self._chunk_pool_lock = threading.Lock()
+        # Pipe audio straight into ffmpeg while downloading instead of going
+        # through a temp file (falls back to a temp file if that fails)
+        self.stream_audio = stream_audio
+        self.model_registry = WhisperModelRegistry(max_loaded_models, self.backend)
+        
+        # HTTP caches (conditional GET for feeds, TTL cache for iTunes lookups)
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.feed_cache = FeedCache(os.path.join(self.cache_dir, 'feeds'))
+        self.lookup_cache = LookupCache(os.path.join(self.cache_dir, 'itunes_lookup.sqlite3'),
+                                        ttl=lookup_ttl, stale_ttl=lookup_stale_ttl)
+        self.transcript_cache = TranscriptCache(os.path.join(self.cache_dir, 'transcripts.sqlite3'))
+        # Downloaded audio is kept (up to audio_cache_bytes) so retries and
+        # model switches don't download it again; 0 disables the cache.
+        # Streamed audio is only written to the cache when the cache was
+        # asked for explicitly, as streaming exists to avoid that disk write.
+        self.audio_cache = None
+        self.cache_streamed_audio = audio_cache_bytes is not None
+        if audio_cache_bytes is None:
+            audio_cache_bytes = self.DEFAULT_AUDIO_CACHE_BYTES
+        if audio_cache_bytes:
+            self.audio_cache = AudioCache(os.path.join(self.cache_dir, 'audio'), audio_cache_bytes)
+        self._lookup_refreshes = set()
+        self._lookup_refresh_lock = threading.Lock()
+        
+        # Be respectful with requests: each host is throttled independently
+        host_limits = dict(self.DEFAULT_HOST_RATE_LIMITS)
+        if self.transcription_server:
+            # Our own worker is not throttled
+            host_limits[urlparse(self.transcription_server).hostname] = (0, 0)
+        host_limits.update(host_rate_limits or {})
+        self.rate_limiter = HostRateLimiter(requests_per_second, burst, host_limits)
+        
+        # Optional asyncio backend (aiohttp), created lazily on first use.
+        # aiohttp sessions are bound to the event loop they were created on,
+        # so there is one per loop (e.g. one per asyncio.run call)
+        self.async_connection_limit = async_connection_limit
+        self._async_sessions = weakref.WeakKeyDictionary()
+        self._async_sessions_lock = threading.Lock()
+        
+        self.session = RateLimitedSession(self.rate_limiter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
         # Disable SSL verification for problematic podcast hosts
         self.session.verify = False
         
-        # Suppress SSL warnings
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        # Suppress SSL warnings
+        import urllib3
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    
+    def extract_podcast_id(self, apple_podcast_url):
+        """Extract podcast ID from Apple Podcasts URL"""
+        # Apple Podcasts URL format: https://podcasts.apple.com/us/podcast/name/id123456789
+        match = re.search(r'/id(\d+)', apple_podcast_url)
+        if match:
+            return match.group(1)
+        return None
+    
+    def get_podcast_info(self, podcast_id, use_cache=True):
+        """Get podcast information from iTunes API
+        
+        Results are cached for ``lookup_ttl`` seconds. Stale entries are still
+        returned immediately while a background thread refreshes them.
+        """
+        if use_cache:
+            state, info = self.lookup_cache.get(podcast_id)
+            if state == LookupCache.STALE:
+                self._refresh_podcast_info_in_background(podcast_id)
+            if state != LookupCache.MISS:
+                return info
+        
+        return self._fetch_podcast_info(podcast_id)
+    
+    def _fetch_podcast_info(self, podcast_id):
+        """Look up a podcast on the iTunes API and cache the result"""
+        url = f"https://itunes.apple.com/lookup?id={podcast_id}&entity=podcast"
+        
+        try:
+            response = self.session.get(url)
+            response.raise_for_status()
+            info = self._parse_podcast_lookup(response.json())
+            if info:
+                self.lookup_cache.put(podcast_id, info)
+            return info
+        except Exception as e:
+            print(f"Error fetching podcast info: {e}")
+            return None
+    
+    def get_podcasts_info(self, podcasts, batch_size=None, use_cache=True):
+        """Look up many podcasts at once
+        
+        ``podcasts`` may mix Apple Podcasts URLs and bare ids. Cache misses are
+        fetched with comma-separated batched lookups of up to ``batch_size``
+        ids per request; stale cache entries are returned and refreshed in
+        the background. Returns a dict mapping podcast id to info (ids that
+        could not be resolved are left out).
+        """
+        batch_size = batch_size or self.LOOKUP_BATCH_SIZE
+        
+        podcast_ids = []
+        for podcast in podcasts:
+            podcast = str(podcast).strip()
+            podcast_id = podcast if podcast.isdigit() else self.extract_podcast_id(podcast)
+            if podcast_id:
+                podcast_ids.append(podcast_id)
+            else:
+                print(f"Could not extract podcast ID from: {podcast}")
+        podcast_ids = list(dict.fromkeys(podcast_ids))
+        
+        results = {}
+        missing = podcast_ids
+        if use_cache:
+            missing, stale = [], []
+            for podcast_id in podcast_ids:
+                state, info = self.lookup_cache.get(podcast_id)
+                if state == LookupCache.MISS:
+                    missing.append(podcast_id)
+                    continue
+                results[podcast_id] = info
+                if state == LookupCache.STALE:
+                    stale.append(podcast_id)
+            if stale:
+                threading.Thread(target=self._fetch_podcasts_info, args=(stale, batch_size),
+                                 name="lookup-refresh-batch", daemon=True).start()
+        
+        if missing:
+            print(f"Looking up {len(missing)} podcasts in batches of {batch_size}...")
+            results.update(self._fetch_podcasts_info(missing, batch_size))
+        return results
+    
+    def _fetch_podcasts_info(self, podcast_ids, batch_size):
+        """Batched iTunes lookups; caches and returns the resolved infos"""
+        results = {}
+        for start in range(0, len(podcast_ids), batch_size):
+            batch = podcast_ids[start:start + batch_size]
+            url = f"https://itunes.apple.com/lookup?id={','.join(batch)}&entity=podcast"
+            try:
+                response = self.session.get(url)
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                print(f"Error fetching podcast info for batch starting at {batch[0]}: {e}")
+                continue
+            
+            found = {}
+            for info in data.get('results', []):
+                podcast_id = str(info.get('collectionId') or info.get('trackId') or '')
+                if podcast_id in batch:
+                    found[podcast_id] = info
+            if found:
+                self.lookup_cache.put_many(found)
+            results.update(found)
+        return results
+    
+    def _refresh_podcast_info_in_background(self, podcast_id):
+        """Revalidate a stale lookup without blocking the caller"""
+        with self._lookup_refresh_lock:
+            if podcast_id in self._lookup_refreshes:
+                return
+            self._lookup_refreshes.add(podcast_id)
+        
+        def refresh():
+            try:
+                self._fetch_podcast_info(podcast_id)
+            finally:
+                with self._lookup_refresh_lock:
+                    self._lookup_refreshes.discard(podcast_id)
+        
+        threading.Thread(target=refresh, name=f"lookup-refresh-{podcast_id}", daemon=True).start()
+    
+    def _parse_podcast_lookup(self, data):
+        """Return the first result of an iTunes lookup response, if any"""
+        if data['resultCount'] > 0:
+            return data['results'][0]
+        return None
+    
+    def get_rss_feed(self, feed_url, use_cache=True):
+        """Parse RSS feed to get episode information
+        
+        With ``use_cache`` the request is made conditional on the ETag /
+        Last-Modified of the previous fetch and a 304 returns the cached feed.
+        """
+        try:
+            import feedparser
+            print(f"Fetching RSS feed: {feed_url}")
+            
+            headers = self.feed_cache.conditional_headers(feed_url) if use_cache else {}
+            
+            # First try to fetch the RSS feed directly
+            response = self.session.get(feed_url, headers=headers)
+            print(f"RSS feed HTTP status: {response.status_code}")
+            
+            if response.status_code == 304:
+                content = self.feed_cache.load(feed_url)
+                if content is not None:
+                    print("RSS feed not modified, using cached copy")
+                    return self._parse_feed(content)
+                # Cache vanished between the two steps; fetch unconditionally
+                return self.get_rss_feed(feed_url, use_cache=False)
+            
+            if response.status_code != 200:
+                print(f"Failed to fetch RSS feed. Status code: {response.status_code}")
+                print(f"Response content: {response.text[:500]}...")
+                return None
+            
+            feed = self._parse_feed(response.content)
+            if use_cache:
+                self.feed_cache.store(feed_url, response.headers, response.content)
+            return feed
+        except ImportError:
+            print("feedparser not installed. Install with: pip install feedparser")
+            return None
+        except Exception as e:
+            print(f"Error parsing RSS feed: {e}")
+            return None
+    
+    def _parse_feed(self, content):
+        """Parse a fetched RSS document with feedparser and report what was found"""
+        import feedparser
+        
+        feed = feedparser.parse(content)
+        
+        # Podcasting 2.0 feeds can list several transcript files per item
+        if b'podcast:transcript' in content:
+            item_transcripts = collect_feed_transcripts(content)
+            if item_transcripts is not None and len(item_transcripts) == len(feed.entries):
+                for entry, transcripts in zip(feed.entries, item_transcripts):
+                    entry['podcast_transcripts'] = transcripts
+        
+        # Debug information
+        print(f"Feed parsed successfully")
+        print(f"Feed title: {feed.feed.get('title', 'Unknown')}")
+        print(f"Feed description: {feed.feed.get('description', 'Unknown')[:100]}...")
+        print(f"Number of entries found: {len(feed.entries)}")
+        
+        if len(feed.entries) == 0:
+            print("No entries found in feed. This could mean:")
+            print("1. The RSS feed is empty or inactive")
+            print("2. The RSS feed URL is incorrect")
+            print("3. The feed format is not standard")
+            print(f"Feed keys: {list(feed.feed.keys())}")
+        
+        return feed
+    
+    def iter_rss_episodes(self, feed_url, use_cache=True):
+        """Yield episode_data dicts while the RSS feed is still downloading
+        
+        Unlike ``get_rss_feed`` the document is never held in memory: items
+        are parsed from the streaming response as they arrive, so the newest
+        episode can be processed right away and memory use doesn't depend on
+        the size of the feed. The body is copied to the feed cache as it
+        streams, and a 304 answer replays the cached copy; feeds the XML
+        parser can't read are re-fetched through feedparser.
+        """
+        import xml.etree.ElementTree as ET
+        
+        print(f"Streaming RSS feed: {feed_url}")
+        headers = self.feed_cache.conditional_headers(feed_url) if use_cache else {}
+        yielded = 0
+        
+        with self.session.get(feed_url, headers=headers, stream=True) as response:
+            print(f"RSS feed HTTP status: {response.status_code}")
+            
+            if response.status_code == 304:
+                content = self.feed_cache.load(feed_url)
+                if content is None:
+                    # Cache vanished between the two steps; fetch unconditionally
+                    yield from self.iter_rss_episodes(feed_url, use_cache=False)
+                    return
+                print("RSS feed not modified, using cached copy")
+                for entry in self._parse_feed(content).entries:
+                    yield self.extract_episode_data(entry)
+                return
+            
+            if response.status_code != 200:
+                print(f"Failed to fetch RSS feed. Status code: {response.status_code}")
+                return
+            
+            chunks = response.iter_content(chunk_size=64 * 1024)
+            if use_cache:
+                # Keep the body for the next 304 as it streams past
+                chunks = self.feed_cache.tee(feed_url, response.headers, chunks)
+            try:
+                for item in iter_feed_items(chunks):
+                    item['transcripts'] = self._transcript_entries(item['transcripts'])
+                    yielded += 1
+                    yield item
+                return
+            except ET.ParseError as e:
+                print(f"Streaming parse failed after {yielded} episodes ({e}), falling back to feedparser")
+            finally:
+                if use_cache:
+                    chunks.close()
+        
+        # feedparser copes with the malformed XML found in the wild; skip the
+        # items that were already handed out
+        feed = self.get_rss_feed(feed_url, use_cache=False)
+        if not feed:
+            # Callers must be able to tell a cut-off feed from a finished one
+            raise IOError(f"could not re-fetch {feed_url} after {yielded} episodes")
+        for entry in feed.entries[yielded:]:
+            yield self.extract_episode_data(entry)
     
-    def extract_podcast_id(self, apple_podcast_url):
-        """Extract podcast ID from Apple Podcasts URL"""
-        # Apple Podcasts URL format: https://podcasts.apple.com/us/podcast/name/id123456789
-        match = re.search(r'/id(\d+)', apple_podcast_url)
-        if match:
-            return match.group(1)
+    def check_transcript_availability(self, episode_url):
+        """Check if transcript is available for an episode"""
+        # This is a simplified check - actual implementation would depend on
+        # the specific podcast platform's transcript availability
+        try:
+            response = self.session.head(episode_url)
+            # Some podcasts include transcript info in headers or metadata
+            return response.status_code == 200
+        except:
+            return False
+    
+    def download_transcript(self, episode_data, output_dir):
+        """Download transcript for a single episode"""
+        # Note: This is a template - actual transcript URLs vary by platform
+        # Some platforms provide transcripts via:
+        # - Dedicated transcript APIs
+        # - Embedded JSON-LD data
+        # - Third-party services like Otter.ai, Rev.com
+        
+        transcript_content = self.fetch_transcript_content(episode_data)
+        return self.save_transcript(episode_data, transcript_content, output_dir)
+    
+    def transcript_filename(self, episode_data):
+        """File name a transcript for this episode is saved under"""
+        episode_title = episode_data.get('title', 'Unknown Episode')
+        safe_title = re.sub(r'[^\w\s-]', '', episode_title)
+        safe_title = re.sub(r'[-\s]+', '-', safe_title)
+        return f"{safe_title}.txt"
+    
+    def save_transcript(self, episode_data, transcript_content, output_dir):
+        """Write a fetched transcript to ``output_dir``; returns True on success"""
+        episode_title = episode_data.get('title', 'Unknown Episode')
+        
+        if transcript_content:
+            filename = self.transcript_filename(episode_data)
+            filepath = os.path.join(output_dir, filename)
+            os.makedirs(output_dir or '.', exist_ok=True)
+            
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(f"Episode: {episode_title}\n")
+                f.write(f"Date: {episode_data.get('published', 'Unknown')}\n")
+                f.write(f"URL: {episode_data.get('link', 'Unknown')}\n")
+                f.write("-" * 50 + "\n\n")
+                f.write(transcript_content)
+            
+            print(f"Downloaded: {filename}")
+            return True
+        else:
+            print(f"No transcript available for: {episode_title}")
+            return False
+    
+    def fetch_transcript_content(self, episode_data, errors=None):
+        """Fetch actual transcript content - now with AI transcription option
+        
+        Sources are tried in order: the text sources of
+        ``fetch_text_transcript``, then Whisper on the audio. The concurrent
+        pipeline runs the same two steps as separate stages. ``errors``
+        collects failed text-source requests, as in fetch_published_transcript.
+        """
+        transcript = self.fetch_text_transcript(episode_data, errors)
+        if transcript:
+            return transcript
+        
+        # Method 2: AI Transcription (if audio URL available)
+        audio_url = episode_data.get('audio_url')
+        if audio_url:
+            print(f"  Attempting AI transcription for audio: {audio_url[:50]}...")
+            return self.transcribe_audio_with_whisper(audio_url)
+        
+        return None
+    
+    def fetch_text_transcript(self, episode_data, errors=None):
+        """Transcript from the sources that need no transcription, or None
+        
+        Transcript files published in the RSS feed come first, then the
+        episode page (Method 1).
+        """
+        return (self.fetch_published_transcript(episode_data.get('transcripts'), errors=errors)
+                or self.check_existing_transcript(episode_data.get('link', ''), errors=errors))
+    
+    def fetch_published_transcript(self, transcripts, errors=None):
+        """Download and normalize a podcast:transcript file listed in the feed
+        
+        Failed requests are reported and skipped; pass a list as ``errors``
+        to also collect their exceptions.
+        """
+        if not transcripts:
+            return None
+        
+        def preference(transcript):
+            transcript_format = transcript.get('format')
+            if transcript_format in TRANSCRIPT_TYPE_PREFERENCE:
+                return TRANSCRIPT_TYPE_PREFERENCE.index(transcript_format)
+            return len(TRANSCRIPT_TYPE_PREFERENCE)
+        
+        for transcript in sorted(transcripts, key=preference):
+            url = transcript.get('url')
+            if not url:
+                continue
+            try:
+                print(f"  Fetching published transcript ({transcript.get('type') or 'unknown type'}): {url[:50]}...")
+                response = self.session.get(url, timeout=30)
+                response.raise_for_status()
+                transcript_format = (transcript.get('format')
+                                     or transcript_format_from_response(response, url))
+                # Decode the bytes ourselves: without a declared charset
+                # requests falls back to ISO-8859-1 for text/* responses,
+                # which garbles UTF-8 transcripts
+                content = response.content.decode(self._page_encoding(response.headers), 'replace')
+                text = normalize_transcript(content, transcript_format)
+                if text:
+                    return text
+            except Exception as e:
+                print(f"  Error fetching published transcript: {e}")
+                if errors is not None:
+                    errors.append(e)
         return None
     
-    def get_podcast_info(self, podcast_id):
-        """Get podcast information from iTunes API"""
-        url = f"https://itunes.apple.com/lookup?id={podcast_id}&entity=podcast"
+    def check_existing_transcript(self, episode_url, errors=None):
+        """Check for existing transcripts on episode page
+        
+        Like ``fetch_published_transcript``, a failed request is appended to
+        ``errors`` when a list is given.
+        """
+        if not episode_url:
+            return None
+        
+        try:
+            # Stream the page through the parser and stop reading as soon as
+            # a transcript has been found, the page turns out not to be HTML
+            # or it grows past max_page_bytes
+            with self.session.get(episode_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                if not self._is_html_response(response.headers):
+                    return None
+                parser = TranscriptHTMLParser(head_only=self.page_scan_head_only)
+                decoder = codecs.getincrementaldecoder(self._page_encoding(response.headers))('replace')
+                received = 0
+                for chunk in response.iter_content(chunk_size=65536):
+                    received += len(chunk)
+                    parser.feed(decoder.decode(chunk))
+                    if parser.done:
+                        break
+                    if received >= self.max_page_bytes:
+                        self._report_page_ceiling(parser)
+                        break
+                else:
+                    parser.feed(decoder.decode(b'', final=True))
+                    parser.close()
+                return parser.transcript
+            
+        except Exception as e:
+            print(f"  Error checking for existing transcript: {e}")
+            if errors is not None:
+                errors.append(e)
+            return None
+    
+    def _is_html_response(self, headers):
+        """Only HTML pages are scanned; e.g. links that point at an MP3 are not"""
+        content_type = headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in ('text/html', 'application/xhtml+xml'):
+            print(f"  Episode link is not an HTML page ({content_type}), skipping page scan")
+            return False
+        return True
+    
+    def _report_page_ceiling(self, parser):
+        if parser.in_container:
+            print(f"  Transcript on episode page exceeds {self.max_page_bytes} bytes, ignoring it")
+        else:
+            print(f"  Stopped scanning episode page after {self.max_page_bytes} bytes")
+    
+    def _page_encoding(self, headers):
+        """Charset declared in Content-Type, defaulting to UTF-8"""
+        match = re.search(r'charset=["\']?([\w.:-]+)', headers.get('Content-Type', ''), re.IGNORECASE)
+        if match:
+            try:
+                return codecs.lookup(match.group(1)).name
+            except LookupError:
+                pass
+        return 'utf-8'
+    
+    async def _get_async_session(self):
+        """Return the running loop's aiohttp session, creating its connection pool on first use"""
+        import asyncio
+        import aiohttp
+        
+        loop = asyncio.get_running_loop()
+        with self._async_sessions_lock:
+            session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            rate_limiter = self.rate_limiter
+            
+            async def on_request_start(session, context, params):
+                await rate_limiter.acquire_async(params.url.host or '')
+            
+            async def on_request_end(session, context, params):
+                if params.response.status == 429:
+                    delay = HostRateLimiter.retry_after(params.response.headers, default=1)
+                    rate_limiter.penalize(params.url.host or '', delay)
+            
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_start.append(on_request_start)
+            trace_config.on_request_end.append(on_request_end)
+            
+            connector = aiohttp.TCPConnector(limit=self.async_connection_limit, ssl=False)
+            session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': self.session.headers['User-Agent']},
+                trace_configs=[trace_config],
+            )
+            with self._async_sessions_lock:
+                self._async_sessions[loop] = session
+        return session
+    
+    async def aclose(self):
+        """Close the running loop's aiohttp session and its pooled connections"""
+        import asyncio
+        
+        with self._async_sessions_lock:
+            session = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+    
+    async def get_podcast_info_async(self, podcast_id, use_cache=True):
+        """Async variant of get_podcast_info (requires aiohttp)"""
+        if use_cache:
+            state, info = self.lookup_cache.get(podcast_id)
+            if state == LookupCache.STALE:
+                self._refresh_podcast_info_in_background(podcast_id)
+            if state != LookupCache.MISS:
+                return info
+        
+        url = f"https://itunes.apple.com/lookup?id={podcast_id}&entity=podcast"
+        
+        try:
+            session = await self._get_async_session()
+            async with session.get(url) as response:
+                response.raise_for_status()
+                # iTunes serves JSON as text/javascript
+                data = await response.json(content_type=None)
+            info = self._parse_podcast_lookup(data)
+            if info:
+                self.lookup_cache.put(podcast_id, info)
+            return info
+        except ImportError:
+            print("aiohttp not installed. Install with: pip install aiohttp")
+            return None
+        except Exception as e:
+            print(f"Error fetching podcast info: {e}")
+            return None
+    
+    async def get_rss_feed_async(self, feed_url, use_cache=True):
+        """Async variant of get_rss_feed (requires aiohttp)"""
+        try:
+            print(f"Fetching RSS feed: {feed_url}")
+            
+            headers = self.feed_cache.conditional_headers(feed_url) if use_cache else {}
+            
+            session = await self._get_async_session()
+            async with session.get(feed_url, headers=headers) as response:
+                print(f"RSS feed HTTP status: {response.status}")
+                content = await response.read()
+            
+            if response.status == 304:
+                cached = self.feed_cache.load(feed_url)
+                if cached is not None:
+                    print("RSS feed not modified, using cached copy")
+                    return self._parse_feed(cached)
+                return await self.get_rss_feed_async(feed_url, use_cache=False)
+            
+            if response.status != 200:
+                print(f"Failed to fetch RSS feed. Status code: {response.status}")
+                print(f"Response content: {content[:500].decode('utf-8', 'replace')}...")
+                return None
+            
+            feed = self._parse_feed(content)
+            if use_cache:
+                self.feed_cache.store(feed_url, response.headers, content)
+            return feed
+        except ImportError as e:
+            print(f"{e.name} not installed. Install with: pip install {e.name}")
+            return None
+        except Exception as e:
+            print(f"Error parsing RSS feed: {e}")
+            return None
+    
+    async def check_existing_transcript_async(self, episode_url):
+        """Async variant of check_existing_transcript (requires aiohttp)"""
+        if not episode_url:
+            return None
+        
+        try:
+            session = await self._get_async_session()
+            async with session.get(episode_url) as response:
+                response.raise_for_status()
+                if not self._is_html_response(response.headers):
+                    return None
+                parser = TranscriptHTMLParser(head_only=self.page_scan_head_only)
+                decoder = codecs.getincrementaldecoder(self._page_encoding(response.headers))('replace')
+                received = 0
+                async for chunk in response.content.iter_chunked(65536):
+                    received += len(chunk)
+                    parser.feed(decoder.decode(chunk))
+                    if parser.done:
+                        break
+                    if received >= self.max_page_bytes:
+                        self._report_page_ceiling(parser)
+                        break
+                else:
+                    parser.feed(decoder.decode(b'', final=True))
+                    parser.close()
+            return parser.transcript
+        except ImportError:
+            print("aiohttp not installed. Install with: pip install aiohttp")
+            return None
+        except Exception as e:
+            print(f"  Error checking for existing transcript: {e}")
+            return None
+    
+    async def check_existing_transcripts_async(self, episodes, concurrency=100):
+        """Scrape many episode pages concurrently from a single thread.
+        
+        Returns a list of transcripts (or None) in the same order as ``episodes``.
+        At most ``concurrency`` pages are in flight at once.
+        """
+        import asyncio
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def check(episode_data):
+            async with semaphore:
+                return await self.check_existing_transcript_async(episode_data.get('link', ''))
+        
+        return await asyncio.gather(*(check(episode_data) for episode_data in episodes))
+    
+    async def download_audio_async(self, audio_url):
+        """Async variant of download_audio
+        
+        Runs download_audio in the event loop's default executor, so it uses
+        the same audio cache, partial-file locks and Range resume; hand the
+        file back with release_audio as usual.
+        """
+        import asyncio
+        
+        return await asyncio.get_running_loop().run_in_executor(None, self.download_audio, audio_url)
+    
+    def unload_whisper_models(self, model_name=None):
+        """Release resident Whisper models (all of them when model_name is None)"""
+        self.model_registry.unload(model_name)
+        if model_name is None or model_name == self._chunk_pool_model:
+            self.shutdown_chunk_pool()
+    
+    def shutdown_chunk_pool(self):
+        """Stop the worker processes used for chunked transcription"""
+        with self._chunk_pool_lock:
+            if self._chunk_pool is not None:
+                self._chunk_pool.shutdown()
+            self._chunk_pool = None
+            self._chunk_pool_model = None
+    
+    def _get_chunk_pool(self, model_name):
+        """Process pool whose workers each keep ``model_name`` loaded
+        
+        Workers are spawned, not forked: by the time the pool starts, this
+        process runs I/O threads and torch/OpenMP thread pools, and a forked
+        child inherits their locks in whatever state they happened to be.
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with self._chunk_pool_lock:
+            if self._chunk_pool is not None and self._chunk_pool_model != model_name:
+                self._chunk_pool.shutdown()
+                self._chunk_pool = None
+            if self._chunk_pool is None:
+                print(f"  Starting {self.chunk_workers} chunk workers with model '{model_name}'...")
+                self._chunk_pool = ProcessPoolExecutor(
+                    max_workers=self.chunk_workers,
+                    initializer=_chunk_worker_init,
+                    initargs=(self.backend, model_name),
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+                self._chunk_pool_model = model_name
+            return self._chunk_pool
+    
+    def _transcribe_in_chunks(self, samples, model_name):
+        """Transcribe long audio as overlapping windows across the process pool"""
+        windows = split_on_silence(samples, self.chunk_seconds, self.chunk_overlap)
+        print(f"  Transcribing {len(samples) / WHISPER_SAMPLE_RATE:.0f}s of audio "
+              f"as {len(windows)} chunks on {self.chunk_workers} workers...")
+        pool = self._get_chunk_pool(model_name)
+        results = list(pool.map(_chunk_worker_transcribe, [samples[start:end] for start, end in windows]))
+        
+        # Each window owns the segments starting between the previous cut and
+        # its own cut; the rest were heard twice in the overlap
+        segments = []
+        previous_cut = 0
+        for (start, end), result in zip(windows, results):
+            offset = start / WHISPER_SAMPLE_RATE
+            for segment in result['segments']:
+                segment = dict(segment, start=segment['start'] + offset, end=segment['end'] + offset)
+                if previous_cut <= segment['start'] < end / WHISPER_SAMPLE_RATE:
+                    segments.append(segment)
+            previous_cut = end / WHISPER_SAMPLE_RATE
+        
+        return {'text': stitch_transcripts([result['text'] for result in results]), 'segments': segments}
+    
+    def whisper_available(self):
+        """Return True when the configured transcription backend can be imported"""
+        return self.backend.available()
+    
+    def transcription_available(self):
+        """Return True when audio can be transcribed locally or by a transcription server"""
+        return bool(self.transcription_server) or self.whisper_available()
+    
+    def transcribe_audio_with_whisper(self, audio_url, model_name=None):
+        """Fetch an episode's audio and transcribe it with the configured backend
+        
+        That is the selected transcription backend (openai-whisper or
+        faster-whisper, see TRANSCRIPTION_BACKENDS) or the transcription
+        server, if one is set.
+        """
+        if not self.transcription_available():
+            print(f"  {self.backend.name} not installed. Install with: {self.backend.install_hint}")
+            print("  Note: This also requires ffmpeg to be installed on your system")
+            return None
+        
+        audio = self.fetch_audio(audio_url)
+        if audio is None:
+            return None
+        return self.transcribe_audio(audio, model_name)
+    
+    def fetch_audio(self, audio_url):
+        """Get audio ready for Whisper: decoded samples when streaming, else a temp file path"""
+        if self.stream_audio:
+            samples = self.stream_decode_audio(audio_url)
+            if samples is not None:
+                return samples
+            print("  Falling back to downloading the audio file first")
+        return self.download_audio(audio_url)
+    
+    def stream_decode_audio(self, audio_url, sample_rate=16000):
+        """Decode audio with ffmpeg while it downloads, without touching the disk
+        
+        Downloaded chunks are piped into ffmpeg's stdin as they arrive and the
+        decoded mono 16 kHz PCM is read back from its stdout, so decoding
+        overlaps the download. Returns a float32 numpy array, or None when the
+        stream can't be decoded this way (e.g. MP4 files whose index sits at
+        the end and need a seekable input).
+        """
+        if not shutil.which('ffmpeg'):
+            print("  ffmpeg not found; streaming decode unavailable")
+            return None
+        try:
+            import numpy as np
+        except ImportError:
+            print("  numpy not installed; streaming decode unavailable")
+            return None
+        
+        print("  Streaming audio into decoder...")
+        try:
+            response = self.session.get(audio_url, stream=True, verify=False, timeout=30)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"    Streaming request failed: {e}")
+            return None
+        
+        etag, length = response.headers.get('ETag'), response.headers.get('Content-Length')
+        if self.audio_cache is not None:
+            cached = self.audio_cache.get(audio_url, etag, length)
+            if cached:
+                response.close()
+                print("  Using cached audio file")
+                try:
+                    return self.backend.load_audio(cached)
+                finally:
+                    self.audio_cache.release(cached)
+        
+        # Keep a copy of the stream for the audio cache, if one was configured
+        tee_path = None
+        if self.audio_cache is not None and self.cache_streamed_audio:
+            tee_path = self.audio_cache.temp_path(audio_url)
+        tee_file = open(tee_path, 'wb') if tee_path else None
+        
+        cmd = [
+            'ffmpeg', '-loglevel', 'error', '-threads', '0', '-i', 'pipe:0',
+            '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(sample_rate), 'pipe:1',
+        ]
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        downloaded = [0]
+        errors = []
+        
+        def feed_decoder():
+            try:
+                for chunk in response.iter_content(chunk_size=65536):
+                    if tee_file:
+                        tee_file.write(chunk)
+                    process.stdin.write(chunk)
+                    downloaded[0] += len(chunk)
+            except BrokenPipeError:
+                # ffmpeg gave up on the input; its exit status reports why
+                pass
+            except Exception as e:
+                errors.append(e)
+            finally:
+                response.close()
+                if tee_file:
+                    tee_file.close()
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+        
+        stderr_chunks = []
+        writer = threading.Thread(target=feed_decoder, daemon=True)
+        stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+        writer.start()
+        stderr_reader.start()
+        pcm = process.stdout.read()
+        process.wait()
+        writer.join()
+        stderr_reader.join()
+        
+        complete = not errors and (not length or not length.isdigit() or downloaded[0] == int(length))
+        if tee_path:
+            if complete and downloaded[0]:
+                self.audio_cache.release(self.audio_cache.put(audio_url, etag, length, tee_path))
+            elif os.path.exists(tee_path):
+                os.unlink(tee_path)
+        
+        if errors:
+            print(f"    Streaming download failed: {errors[0]}")
+            return None
+        if process.returncode != 0 or not pcm:
+            message = b''.join(stderr_chunks).decode('utf-8', 'replace').strip()
+            print(f"    ffmpeg could not decode the stream: {message[-200:]}")
+            return None
+        
+        print(f"  Streamed {downloaded[0]} bytes ({len(pcm) / 2 / sample_rate:.0f}s of audio)")
+        return np.frombuffer(pcm, np.int16).flatten().astype(np.float32) / 32768.0
+    
+    def _new_audio_file(self, audio_url):
+        """Open a file to download audio into (in the cache directory when caching)"""
+        import tempfile
+        
+        if self.audio_cache is not None:
+            return open(self.audio_cache.temp_path(audio_url), 'wb')
+        return tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+    
+    def release_audio(self, path):
+        """Done with a file from download_audio: unpin cached audio, delete temp files"""
+        if self.audio_cache is not None and self.audio_cache.owns(path):
+            self.audio_cache.release(path)
+        elif os.path.exists(path):
+            os.unlink(path)
+    
+    def download_audio(self, audio_url):
+        """Download an audio enclosure and return the path of the local file
+        
+        With the audio cache enabled the file lives in the cache and must be
+        handed back with release_audio; otherwise it is a temp file.
+        Interrupted single-stream downloads are kept as partial files and
+        resumed with Range requests on the next attempt, here or in a later run.
+        """
+        print("  Downloading audio file...")
+        partial_path = self._partial_path(audio_url)
+        
+        # The same enclosure can be requested twice at once (duplicate feed
+        # items, shows sharing audio, several downloader processes sharing
+        # the cache directory); the second download waits and then usually
+        # finds the first one's file in the audio cache
+        self._lock_partial(partial_path)
+        try:
+            # Method 1: Use requests with SSL disabled, resuming after interruptions
+            for attempt in range(self.download_retries + 1):
+                try:
+                    return self._download_audio_attempt(audio_url, partial_path)
+                except Exception as e:
+                    kept = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+                    print(f"    Method 1 failed: {e}")
+                    if not self._retryable_download_error(e):
+                        break
+                    if attempt < self.download_retries:
+                        delay = min(30, 2 ** attempt)
+                        print(f"    Retrying in {delay}s, resuming from byte {kept}...")
+                        time.sleep(delay)
+            
+            # Method 2: Use urllib with SSL context disabled
+            try:
+                print("  Trying alternative download method...")
+                return self._download_audio_urllib(audio_url, partial_path)
+            except Exception as e2:
+                print(f"    Method 2 also failed: {e2}")
+                return None
+        finally:
+            self._unlock_partial(partial_path)
+    
+    def _retryable_download_error(self, error):
+        """Connection problems and transient HTTP statuses are retried, e.g. a 404 is not"""
+        if isinstance(error, requests.HTTPError):
+            return error.response is not None and error.response.status_code in self.RETRYABLE_STATUSES
+        # Dropped connections, timeouts and short reads all surface as OSError
+        return isinstance(error, OSError)
+    
+    def _lock_partial(self, partial_path):
+        """Wait until no other thread or process is writing ``partial_path``
+        
+        Threads of this process queue on a lock per path; the holder then
+        takes an exclusive file lock on ``<partial>.lock``, which other
+        processes using the same cache directory also wait for.
+        """
+        with self._partial_locks_lock:
+            entry = self._partial_locks.setdefault(partial_path, [threading.Lock(), 0, None])
+            entry[1] += 1
+        entry[0].acquire()
+        try:
+            entry[2] = _lock_file(partial_path + '.lock')
+        except BaseException:
+            self._unlock_partial(partial_path)
+            raise
+    
+    def _unlock_partial(self, partial_path):
+        with self._partial_locks_lock:
+            entry = self._partial_locks[partial_path]
+            if entry[2] is not None:
+                _unlock_file(entry[2])
+                entry[2] = None
+            entry[0].release()
+            entry[1] -= 1
+            if not entry[1]:
+                del self._partial_locks[partial_path]
+    
+    def _partial_path(self, audio_url):
+        """Stable location of the partial download for ``audio_url``"""
+        partial_dir = os.path.join(self.cache_dir, 'partial')
+        os.makedirs(partial_dir, exist_ok=True)
+        return os.path.join(partial_dir, AudioCache.key(audio_url) + '.partial')
+    
+    def _resume_headers(self, partial_path):
+        """Range / If-Range headers continuing a partial download, if there is one"""
+        if not os.path.exists(partial_path) or not os.path.exists(partial_path + '.json'):
+            return {}, None
+        try:
+            with open(partial_path + '.json', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}, None
+        
+        # If-Range needs a strong ETag or a Last-Modified date; without
+        # either there's no way to know the file hasn't changed
+        validator = meta.get('etag') if meta.get('etag') and not meta['etag'].startswith('W/') else None
+        validator = validator or meta.get('last_modified')
+        offset = os.path.getsize(partial_path)
+        if not validator or not offset:
+            return {}, None
+        return {'Range': f"bytes={offset}-", 'If-Range': validator}, meta
+    
+    def _start_partial(self, partial_path, headers):
+        """Record the validators of a fresh download so it can be resumed later"""
+        meta = {
+            'etag': headers.get('ETag'),
+            'length': headers.get('Content-Length'),
+            'last_modified': headers.get('Last-Modified'),
+        }
+        _atomic_write(partial_path + '.json', json.dumps(meta).encode('utf-8'))
+        return meta
+    
+    def _discard_partial(self, partial_path):
+        for path in (partial_path, partial_path + '.json'):
+            if os.path.exists(path):
+                os.unlink(path)
+    
+    def _resumed_total(self, content_range):
+        """Total size from a 206 Content-Range header ("bytes 100-199/200")"""
+        match = re.search(r'/(\d+)\s*$', content_range or '')
+        return match.group(1) if match else None
+    
+    def _download_audio_attempt(self, audio_url, partial_path):
+        """One requests-based download attempt; raises if it is interrupted"""
+        headers, meta = self._resume_headers(partial_path)
+        with self.session.get(audio_url, headers=headers, stream=True, verify=False, timeout=30) as response:
+            if response.status_code == 416:
+                # Our partial file no longer matches anything on the server
+                self._discard_partial(partial_path)
+                raise IOError("stale partial download discarded")
+            response.raise_for_status()
+            
+            resumed = bool(headers) and response.status_code == 206
+            if resumed:
+                if meta.get('length') and self._resumed_total(response.headers.get('Content-Range')) != meta['length']:
+                    self._discard_partial(partial_path)
+                    raise IOError("file size changed since the partial download")
+                print(f"  Resuming download at byte {os.path.getsize(partial_path)}")
+            else:
+                etag, length = response.headers.get('ETag'), response.headers.get('Content-Length')
+                if self.audio_cache is not None:
+                    cached = self.audio_cache.get(audio_url, etag, length)
+                    if cached:
+                        print(f"  Using cached audio file ({os.path.getsize(cached)} bytes)")
+                        return cached
+                
+                ranged = (self.range_download_parts > 1 and length and length.isdigit()
+                          and int(length) >= self.range_download_threshold
+                          and response.headers.get('Accept-Ranges', '').lower() == 'bytes')
+                if ranged:
+                    self._discard_partial(partial_path)
+                    return self._download_audio_ranged(audio_url, response, int(length))
+                
+                # A 200 answer to a resume request means the file changed
+                meta = self._start_partial(partial_path, response.headers)
+            
+            # Read in small pieces so a dropped connection loses little of what
+            # arrived; the file buffer still keeps the writes large
+            with open(partial_path, 'ab' if resumed else 'wb', buffering=self.download_buffer) as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+        
+        size = os.path.getsize(partial_path)
+        if meta.get('length') and meta['length'].isdigit() and size < int(meta['length']):
+            raise IOError(f"connection closed after {size} of {meta['length']} bytes")
+        return self._finish_download(audio_url, meta.get('etag'), meta.get('length'), partial_path)
+    
+    def _download_audio_ranged(self, audio_url, response, length):
+        """Parallel byte-range download into a preallocated file"""
+        etag = response.headers.get('ETag')
+        with self._new_audio_file(audio_url) as temp_file:
+            temp_filename = temp_file.name
+            # Preallocate so every range can be written in place
+            temp_file.truncate(length)
+        response.close()
+        try:
+            # Ranges go straight to the final URL, skipping tracking redirects
+            self._download_in_ranges(response.url, temp_filename, length, etag)
+        except BaseException:
+            os.unlink(temp_filename)
+            raise
+        return self._finish_download(audio_url, etag, str(length), temp_filename)
+    
+    def _download_audio_urllib(self, audio_url, partial_path):
+        """urllib-based download, for hosts the requests session can't talk to"""
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        
+        headers, meta = self._resume_headers(partial_path)
+        self.rate_limiter.acquire(urlparse(audio_url).hostname or '')
+        req = urllib.request.Request(audio_url, headers=dict(headers, **{
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+        }))
+        
+        with urllib.request.urlopen(req, context=ssl_context, timeout=30) as response:
+            resumed = bool(headers) and response.status == 206
+            if not resumed:
+                meta = self._start_partial(partial_path, response.headers)
+            with open(partial_path, 'ab' if resumed else 'wb') as f:
+                shutil.copyfileobj(response, f, self.download_buffer)
+        
+        return self._finish_download(audio_url, meta.get('etag'), meta.get('length'), partial_path)
+    
+    def _finish_download(self, audio_url, etag, length, path):
+        """Validate a completed download and move it to its final place"""
+        if os.path.exists(path + '.json'):
+            os.unlink(path + '.json')
+        
+        # Check if file was actually downloaded
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            print("  Downloaded file is empty or doesn't exist")
+            if os.path.exists(path):
+                os.unlink(path)
+            return None
+        
+        file_size = os.path.getsize(path)
+        print(f"  Downloaded {file_size} bytes")
+        if self.audio_cache is not None:
+            return self.audio_cache.put(audio_url, etag, length, path)
+        
+        # Hand out a uniquely named file; the partial path is reused by retries
+        import tempfile
+        fd, final_path = tempfile.mkstemp(suffix='.mp3', dir=os.path.dirname(path))
+        os.close(fd)
+        os.replace(path, final_path)
+        return final_path
+    
+    def _download_in_ranges(self, url, path, length, etag):
+        """Fill a preallocated file with parallel byte-range requests"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        parts = self.range_download_parts
+        part_size = -(-length // parts)
+        ranges = [(start, min(start + part_size, length) - 1) for start in range(0, length, part_size)]
+        print(f"  Downloading {length} bytes as {len(ranges)} parallel ranges...")
+        
+        try:
+            with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="range") as pool:
+                futures = [pool.submit(self._download_range, url, path, start, end, etag)
+                           for start, end in ranges]
+                for future in futures:
+                    future.result()
+        except RangeRequestError as e:
+            print(f"    {e}; downloading as a single stream instead")
+            with self.session.get(url, stream=True, verify=False, timeout=30) as response:
+                response.raise_for_status()
+                with open(path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=self.download_buffer):
+                        f.write(chunk)
+    
+    def _download_range(self, url, path, start, end, etag, retries=3):
+        """Download bytes start..end (inclusive) into ``path``, resuming after drops"""
+        position = start
+        attempt = 0
+        while position <= end:
+            headers = {'Range': f"bytes={position}-{end}"}
+            if etag:
+                # Only accept the range if the file hasn't changed meanwhile
+                headers['If-Range'] = etag
+            try:
+                with self.session.get(url, headers=headers, stream=True, verify=False, timeout=30) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise RangeRequestError(f"server answered a range request with {response.status_code}")
+                    with open(path, 'r+b') as f:
+                        f.seek(position)
+                        for chunk in response.iter_content(chunk_size=self.download_buffer):
+                            chunk = chunk[:end + 1 - position]
+                            f.write(chunk)
+                            position += len(chunk)
+                            if position > end:
+                                break
+                if position <= end:
+                    raise IOError(f"connection closed at byte {position}")
+            except RangeRequestError:
+                raise
+            except Exception as e:
+                attempt += 1
+                if attempt > retries:
+                    raise
+                print(f"    Range {start}-{end} interrupted at byte {position} ({e}), resuming...")
+    
+    def transcribe_audio(self, audio, model_name=None):
+        """Transcribe decoded samples or a downloaded audio file (released afterwards) with Whisper"""
+        result = self.transcribe_audio_result(audio, model_name)
+        return result["text"] if result else None
+    
+    def transcribe_audio_result(self, audio, model_name=None):
+        """Like transcribe_audio, but return ``{"text", "segments"}``
         
+        Segment times always refer to the original recording, also when the
+        VAD pre-pass removed non-speech audio before transcription. Results
+        from the transcription server carry text only.
+        """
+        model_name = model_name or self.whisper_model
+        temp_filename = audio if isinstance(audio, str) else None
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            data = response.json()
+            # Identical audio (syndicated shows, re-runs) is only transcribed once
+            audio_hash = TranscriptCache.audio_hash(audio)
+            settings = self._transcription_settings(model_name)
+            cached = self.transcript_cache.get(audio_hash, settings)
+            if cached is not None:
+                print("  Using cached transcription of identical audio")
+                return cached
             
-            if data['resultCount'] > 0:
-                return data['results'][0]
+            result = self._transcribe_audio_uncached(audio, model_name)
+            if result is not None:
+                self.transcript_cache.put(audio_hash, settings, result)
+            return result
+            
+        except ImportError:
+            print(f"  {self.backend.name} not installed. Install with: {self.backend.install_hint}")
+            print("  Note: This also requires ffmpeg to be installed on your system")
             return None
         except Exception as e:
-            print(f"Error fetching podcast info: {e}")
+            print(f"  Error during transcription: {e}")
             return None
+        finally:
+            # Clean up temp file (cached audio is only unpinned)
+            if temp_filename:
+                self.release_audio(temp_filename)
+    
+    def _transcription_settings(self, model_name):
+        """Everything besides the audio that affects a transcription result"""
+        settings = {'backend': self.backend.name, 'model': model_name, 'vad': bool(self.vad)}
+        settings.update(self.backend.options())
+        if self.transcription_server:
+            # The server may run another backend, and its results carry no
+            # segments, so they must not answer for local transcriptions
+            settings['server'] = self.transcription_server
+        if self.chunk_workers > 1:
+            settings.update(chunk_seconds=self.chunk_seconds, chunk_overlap=self.chunk_overlap)
+        return settings
     
-    def get_rss_feed(self, feed_url):
-        """Parse RSS feed to get episode information"""
+    def _transcribe_audio_uncached(self, audio, model_name):
+        """VAD, chunking, remote or local transcription of one episode's audio"""
+        temp_filename = audio if isinstance(audio, str) else None
+        speech_map = None
+        if self.vad or self.chunk_workers > 1:
+            samples = self.backend.load_audio(audio) if temp_filename else audio
+            if self.vad:
+                original_seconds = len(samples) / WHISPER_SAMPLE_RATE
+                samples, speech_map = remove_non_speech(samples)
+                print(f"  VAD kept {len(samples) / WHISPER_SAMPLE_RATE:.0f}s of speech "
+                      f"out of {original_seconds:.0f}s")
+                if len(samples) == 0:
+                    print("  No speech detected")
+                    return None
+            audio = samples
+        
+        if self.transcription_server:
+            text = self._transcribe_remote(audio, model_name)
+            if text is not None:
+                return {'text': text, 'segments': []}
+            print("  Falling back to local transcription")
+        
+        # Fix SSL issues for Whisper model downloads
+        ssl._create_default_https_context = ssl._create_unverified_context
+        
+        if self.chunk_workers > 1 and len(audio) > 1.5 * self.chunk_seconds * WHISPER_SAMPLE_RATE:
+            result = self._transcribe_in_chunks(audio, model_name)
+            if speech_map is not None:
+                result['segments'] = speech_map.remap_segments(result['segments'])
+            return result
+        
+        # Load Whisper model once (downloads on first use) and reuse it
+        # for every following episode; each concurrent transcription
+        # borrows its own copy
         try:
-            import feedparser
-            print(f"Fetching RSS feed: {feed_url}")
-            
-            # First try to fetch the RSS feed directly
-            response = self.session.get(feed_url)
-            print(f"RSS feed HTTP status: {response.status_code}")
-            
-            if response.status_code != 200:
-                print(f"Failed to fetch RSS feed. Status code: {response.status_code}")
-                print(f"Response content: {response.text[:500]}...")
-                return None
-            
-            feed = feedparser.parse(response.content)
-            
-            # Debug information
-            print(f"Feed parsed successfully")
-            print(f"Feed title: {feed.feed.get('title', 'Unknown')}")
-            print(f"Feed description: {feed.feed.get('description', 'Unknown')[:100]}...")
-            print(f"Number of entries found: {len(feed.entries)}")
-            
-            if len(feed.entries) == 0:
-                print("No entries found in feed. This could mean:")
-                print("1. The RSS feed is empty or inactive")
-                print("2. The RSS feed URL is incorrect")
-                print("3. The feed format is not standard")
-                print(f"Feed keys: {list(feed.feed.keys())}")
-            
-            return feed
+            model = self.model_registry.checkout(model_name)
         except ImportError:
-            print("feedparser not installed. Install with: pip install feedparser")
-            return None
-        except Exception as e:
-            print(f"Error parsing RSS feed: {e}")
+            raise
+        except Exception as model_error:
+            print(f"  Error loading Whisper model: {model_error}")
+            print("  This might be a first-run model download issue.")
+            print("  Try running this command separately first:")
+            print(f"  {self.backend.preload_hint(model_name)}")
             return None
+        
+        print(f"  Transcribing audio with {self.backend.name}...")
+        try:
+            # Transcribe
+            result = self.backend.transcribe(model, audio)
+        finally:
+            self.model_registry.checkin(model_name, model)
+        if speech_map is not None:
+            result['segments'] = speech_map.remap_segments(result['segments'])
+        
+        return result
     
-    def check_transcript_availability(self, episode_url):
-        """Check if transcript is available for an episode"""
-        # This is a simplified check - actual implementation would depend on
-        # the specific podcast platform's transcript availability
+    def _transcribe_remote(self, audio, model_name):
+        """Send a transcription job to the shared transcription server"""
+        url = f"{self.transcription_server}/transcribe"
+        print(f"  Sending audio to transcription server {self.transcription_server}...")
         try:
-            response = self.session.head(episode_url)
-            # Some podcasts include transcript info in headers or metadata
-            return response.status_code == 200
-        except:
-            return False
+            if isinstance(audio, str):
+                # Same box: pass the file path rather than the bytes
+                response = self.session.post(url, json={'path': os.path.abspath(audio), 'model': model_name},
+                                             timeout=None)
+            else:
+                import numpy as np
+                response = self.session.post(url, data=np.asarray(audio, dtype=np.float32).tobytes(),
+                                             headers={'Content-Type': 'application/octet-stream',
+                                                      'X-Whisper-Model': model_name},
+                                             timeout=None)
+            response.raise_for_status()
+            return response.json()['text']
+        except Exception as e:
+            print(f"  Transcription server error: {e}")
+            return None
     
-    def download_transcript(self, episode_data, output_dir):
-        """Download transcript for a single episode"""
-        episode_title = episode_data.get('title', 'Unknown Episode')
-        safe_title = re.sub(r'[^\w\s-]', '', episode_title)
-        safe_title = re.sub(r'[-\s]+', '-', safe_title)
+    def extract_episode_data(self, entry):
+        """Build the episode_data dict used by the pipeline from a feed entry"""
+        # Extract audio URL from entry
+        audio_url = None
+        if hasattr(entry, 'enclosures') and entry.enclosures:
+            audio_url = entry.enclosures[0].href
+        elif hasattr(entry, 'links'):
+            for link in entry.links:
+                if link.get('type', '').startswith('audio/'):
+                    audio_url = link.href
+                    break
         
-        # Note: This is a template - actual transcript URLs vary by platform
-        # Some platforms provide transcripts via:
-        # - Dedicated transcript APIs
-        # - Embedded JSON-LD data
-        # - Third-party services like Otter.ai, Rev.com
-        
-        transcript_content = self.fetch_transcript_content(episode_data)
+        # Publisher transcript files (podcast:transcript)
+        transcripts = entry.get('podcast_transcripts')
+        if transcripts is None:
+            transcripts = [entry['podcast_transcript']] if entry.get('podcast_transcript') else []
+        transcripts = self._transcript_entries(transcripts)
         
-        if transcript_content:
-            filename = f"{safe_title}.txt"
-            filepath = os.path.join(output_dir, filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"Episode: {episode_title}\n")
-                f.write(f"Date: {episode_data.get('published', 'Unknown')}\n")
-                f.write(f"URL: {episode_data.get('link', 'Unknown')}\n")
-                f.write("-" * 50 + "\n\n")
-                f.write(transcript_content)
-            
-            print(f"Downloaded: {filename}")
-            return True
-        else:
-            print(f"No transcript available for: {episode_title}")
-            return False
+        return {
+            'guid': entry.get('id', ''),
+            'title': entry.get('title', 'Unknown Episode'),
+            'link': entry.get('link', ''),
+            'published': entry.get('published', ''),
+            'description': entry.get('summary', ''),
+            'audio_url': audio_url,
+            'transcripts': transcripts,
+        }
     
-    def fetch_transcript_content(self, episode_data):
-        """Fetch actual transcript content - now with AI transcription option"""
-        episode_url = episode_data.get('link', '')
-        audio_url = episode_data.get('audio_url', '')
+    def _transcript_entries(self, transcripts):
+        """Tag podcast:transcript dicts with their detected format, dropping ones without a URL"""
+        return [
+            dict(transcript, format=transcript_format(transcript.get('type'), transcript.get('url', '')))
+            for transcript in transcripts if transcript.get('url')
+        ]
+    
+    def episodes_since(self, episodes, mark, sync=None):
+        """Yield episodes until the one recorded by the high-water ``mark``
         
-        # Method 1: Look for existing transcripts in episode page
-        transcript = self.check_existing_transcript(episode_url)
-        if transcript:
-            return transcript
+        Feeds list the newest episode first, so iteration stops at the first
+        episode matching the mark's GUID or published before it; closing the
+        underlying generator also stops a streamed feed download. ``sync``
+        (a dict) receives the episodes handed out as ``'episodes'`` (newest
+        first) and, once the old mark or the end of the feed has been
+        reached, ``'complete'``; only then may the caller advance the mark,
+        as episodes after a feed that broke off would otherwise be skipped
+        for good.
+        """
+        sync = sync if sync is not None else {}
+        sync.setdefault('episodes', [])
+        sync['complete'] = False
+        mark_time = published_timestamp(mark.get('published')) if mark else None
+        for episode_data in episodes:
+            if mark:
+                if mark.get('guid') and episode_data.get('guid') == mark['guid']:
+                    break
+                published = published_timestamp(episode_data.get('published'))
+                if published is not None and mark_time is not None and published < mark_time:
+                    break
+            sync['episodes'].append(episode_data)
+            yield episode_data
+        sync['complete'] = True
+        if hasattr(episodes, 'close'):
+            episodes.close()
+    
+    def _advance_high_water_mark(self, state_store, feed_url, sync):
+        """Move the feed's mark to the newest episode of a sync that ran to completion
         
-        # Method 2: AI Transcription (if audio URL available)
+        Episodes deferred by the transcription budget must stay ahead of the
+        mark so the next run reaches them; the mark then only moves to the
+        newest episode older than all of them.
+        """
+        episodes = sync.get('episodes') or []
+        if not sync.get('complete'):
+            if episodes:
+                print(f"Feed {feed_url} was not read to the end; keeping its previous high-water mark")
+            return
+        deferred = [i for i, episode_data in enumerate(episodes) if episode_data.get('deferred')]
+        if deferred:
+            episodes = episodes[deferred[-1] + 1:]
+            print(f"Feed {feed_url} has {len(deferred)} deferred episodes; "
+                  f"the high-water mark stays behind them")
+        if episodes:
+            state_store.set_high_water_mark(feed_url, episodes[0].get('guid'), episodes[0].get('published'))
+    
+    def _wants_audio(self, episode_data):
+        """True when an episode without a transcript can still go to Whisper"""
+        return bool(episode_data.get('audio_url')) and self.transcription_available()
+    
+    def _fetch_text_stage(self, episode_data, label):
+        """I/O stage: published transcript files, then the episode page"""
+        print(f"\nProcessing episode {label}: {episode_data['title']}")
+        audio_url = episode_data.get('audio_url')
         if audio_url:
-            print(f"  Attempting AI transcription for audio: {audio_url[:50]}...")
-            return self.transcribe_audio_with_whisper(audio_url)
+            print(f"  Found audio URL: {audio_url[:50]}...")
+        else:
+            print("  No audio URL found")
         
-        return None
+        return self.fetch_text_transcript(episode_data)
     
-    def check_existing_transcript(self, episode_url):
-        """Check for existing transcripts on episode page"""
-        if not episode_url:
-            return None
+    def _fetch_audio_stage(self, episode_data, audio_slots):
+        """I/O stage: fetch the audio for Whisper
         
+        The download waits for a free slot so audio never piles up far ahead
+        of the transcription stage.
+        """
+        # Method 2: AI Transcription (if audio URL available)
+        audio_url = episode_data['audio_url']
+        audio_slots.acquire()
         try:
-            response = self.session.get(episode_url)
-            response.raise_for_status()
-            content = response.text
-            
-            # Look for common transcript patterns
-            # JSON-LD structured data
-            json_ld_match = re.search(r'<script type="application/ld\+json">(.*?)</script>', content, re.DOTALL)
-            if json_ld_match:
-                try:
-                    ld_data = json.loads(json_ld_match.group(1))
-                    if 'transcript' in ld_data:
-                        return ld_data['transcript']
-                except:
-                    pass
-            
-            # Look for transcript divs/sections
-            transcript_patterns = [
-                r'<div[^>]*class="[^"]*transcript[^"]*"[^>]*>(.*?)</div>',
-                r'<section[^>]*class="[^"]*transcript[^"]*"[^>]*>(.*?)</section>',
-                r'<div[^>]*id="transcript"[^>]*>(.*?)</div>'
-            ]
-            
-            for pattern in transcript_patterns:
-                match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-                if match:
-                    # Clean up HTML
-                    import html
-                    transcript = re.sub(r'<[^>]+>', '', match.group(1))
-                    return html.unescape(transcript.strip())
-            
-            return None
-            
-        except Exception as e:
-            print(f"  Error checking for existing transcript: {e}")
-            return None
+            print(f"  Attempting AI transcription for audio: {audio_url[:50]}...")
+            audio = self.fetch_audio(audio_url)
+        except BaseException:
+            audio_slots.release()
+            raise
+        if audio is None:
+            audio_slots.release()
+        return audio
     
-    def transcribe_audio_with_whisper(self, audio_url):
-        """Transcribe audio using OpenAI Whisper (requires openai-whisper package)"""
+    def _transcribe_stage(self, audio, audio_slots, scheduler=None):
+        """CPU stage: run Whisper on a downloaded audio file
+        
+        Returns ``EpisodeScheduler.DEFERRED`` without transcribing when the
+        scheduler's budget or deadline ran out while the job was queued.
+        """
+        if scheduler is not None and not scheduler.whisper_allowed():
+            audio_slots.release()
+            if isinstance(audio, str):
+                self.release_audio(audio)
+            return EpisodeScheduler.DEFERRED
+        
+        started = time.monotonic()
         try:
-            import whisper
-            import tempfile
-            import os
-            import ssl
-            
-            # Fix SSL issues for Whisper model downloads
-            ssl._create_default_https_context = ssl._create_unverified_context
-            
-            print("  Downloading audio file...")
-            
-            # Try multiple methods to download the audio file
-            temp_filename = None
-            
-            # Method 1: Use requests with SSL disabled
+            return self.transcribe_audio(audio)
+        finally:
+            audio_slots.release()
+            if scheduler is not None:
+                scheduler.charge(time.monotonic() - started)
+    
+    def _record_deferred(self, episode_data, state_store):
+        """Leave an episode refused by the transcription budget for a later run"""
+        print(f"  Deferring transcription of {episode_data['title']}: budget exhausted")
+        # Keeps incremental syncs from moving the high-water mark past it
+        episode_data['deferred'] = True
+        if state_store is not None:
+            state_store.mark(state_store.episode_key(episode_data), 'deferred',
+                             episode_data.get('title'), error="transcription budget exhausted")
+    
+    def _already_done(self, episode_data, output_dir, state_store):
+        """Check the state store (and legacy output files) for finished episodes"""
+        output_dir = episode_data.get('output_dir') or output_dir
+        key = state_store.episode_key(episode_data)
+        if state_store.is_complete(key):
+            return True
+        
+        # Transcripts written before the state store existed are adopted as-is
+        filepath = os.path.join(output_dir, self.transcript_filename(episode_data))
+        if state_store.get(key) is None and os.path.exists(filepath):
+            state_store.mark(key, 'done', episode_data.get('title'),
+                             state_store.file_hash(filepath), filepath)
+            return True
+        return False
+    
+    def _record_result(self, episode_data, output_dir, state_store, saved):
+        """Store the outcome of an episode in the state store"""
+        output_dir = episode_data.get('output_dir') or output_dir
+        key = state_store.episode_key(episode_data)
+        if saved:
+            filepath = os.path.join(output_dir, self.transcript_filename(episode_data))
+            state_store.mark(key, 'done', episode_data.get('title'),
+                             state_store.file_hash(filepath), filepath)
+        else:
+            state_store.mark(key, 'failed', episode_data.get('title'), error="no transcript available")
+    
+    def process_episodes(self, episodes, output_dir, io_workers=4, cpu_workers=1, state_store=None,
+                         scheduler=None):
+        """Run episodes through the staged fetch/transcribe pipeline.
+        
+        Page scraping and audio downloads run on a pool of ``io_workers``
+        threads while transcription runs on a separate pool of ``cpu_workers``,
+        so network waits overlap with Whisper. Episodes already completed
+        according to ``state_store`` are skipped without any network access.
+        ``episodes`` may be a generator (see ``iter_rss_episodes``); it is only
+        read as the fetch stage has room. An episode carrying an ``output_dir``
+        key is saved there instead of ``output_dir``. Work is taken in feed
+        order unless an ``EpisodeScheduler`` says otherwise. Returns
+        (successful, failed, skipped); Whisper jobs deferred by the
+        scheduler's budget count as failed.
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        
+        total = len(episodes) if hasattr(episodes, '__len__') else None
+        skipped_downloads = 0
+        deferred_downloads = 0
+        
+        def unfinished():
+            nonlocal skipped_downloads
             try:
-                response = self.session.get(audio_url, stream=True, verify=False, timeout=30)
-                response.raise_for_status()
-                
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        temp_file.write(chunk)
-                    temp_filename = temp_file.name
-                    
+                for episode_data in episodes:
+                    if state_store is not None and self._already_done(episode_data, output_dir, state_store):
+                        skipped_downloads += 1
+                        continue
+                    yield episode_data
             except Exception as e:
-                print(f"    Method 1 failed: {e}")
+                # A feed that breaks off mid-stream still leaves the episodes
+                # read so far to finish
+                print(f"Error reading episodes: {e}")
+        
+        source = unfinished()
+        if scheduler is None:
+            scheduler = EpisodeScheduler(priority=(), whisper_last=False, lookahead=max(1, io_workers) * 2)
+        scheduler.start()
+        
+        # Downloaded audio waiting for (or in) transcription is capped so a
+        # fast network doesn't fill the disk with temp files
+        audio_slots = threading.BoundedSemaphore(max(1, cpu_workers) * 2)
+        # One model copy per CPU worker, loaded as the workers need them
+        self.model_registry.copies_per_model = max(self.model_registry.copies_per_model, cpu_workers)
+        successful_downloads = 0
+        failed_downloads = 0
+        
+        with ThreadPoolExecutor(max_workers=max(1, io_workers), thread_name_prefix="io") as io_pool, \
+                ThreadPoolExecutor(max_workers=max(1, cpu_workers), thread_name_prefix="cpu") as cpu_pool:
+            pending = {}
+            fetching = set()
+            index = 0
+            while True:
+                # Take work only while the fetch stage has room, so a
+                # streamed feed is consumed at the pace it's processed
+                while len(fetching) < max(1, io_workers) * 2:
+                    scheduler.fill(source)
+                    job = scheduler.pop()
+                    if job is None:
+                        break
+                    episode_data, whisper = job
+                    if whisper:
+                        # No point downloading audio that won't be transcribed
+                        if not scheduler.whisper_allowed():
+                            self._record_deferred(episode_data, state_store)
+                            deferred_downloads += 1
+                            continue
+                        future = io_pool.submit(self._fetch_audio_stage, episode_data, audio_slots)
+                        pending[future] = (episode_data, 'audio')
+                    else:
+                        index += 1
+                        label = f"{index}/{total}" if total is not None else str(index)
+                        future = io_pool.submit(self._fetch_text_stage, episode_data, label)
+                        pending[future] = (episode_data, 'text')
+                    fetching.add(future)
                 
-                # Method 2: Use urllib with SSL context disabled
-                try:
-                    print("  Trying alternative download method...")
-                    ssl_context = ssl.create_default_context()
-                    ssl_context.check_hostname = False
-                    ssl_context.verify_mode = ssl.CERT_NONE
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    episode_data, stage = pending.pop(future)
+                    fetching.discard(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"  Error processing {episode_data['title']}: {e}")
+                        result = None
                     
-                    req = urllib.request.Request(audio_url, headers={
-                        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-                    })
+                    if stage == 'text' and not result and self._wants_audio(episode_data):
+                        if scheduler.whisper_last:
+                            scheduler.push(episode_data, whisper=True)
+                            continue
+                        future = io_pool.submit(self._fetch_audio_stage, episode_data, audio_slots)
+                        pending[future] = (episode_data, 'audio')
+                        fetching.add(future)
+                        continue
                     
-                    with urllib.request.urlopen(req, context=ssl_context, timeout=30) as response:
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                            temp_file.write(response.read())
-                            temp_filename = temp_file.name
-                            
-                except Exception as e2:
-                    print(f"    Method 2 also failed: {e2}")
-                    return None
-            
-            if not temp_filename:
-                print("  Failed to download audio file")
-                return None
-                
-            # Check if file was actually downloaded
-            if not os.path.exists(temp_filename) or os.path.getsize(temp_filename) == 0:
-                print("  Downloaded file is empty or doesn't exist")
-                if os.path.exists(temp_filename):
-                    os.unlink(temp_filename)
-                return None
-            
-            file_size = os.path.getsize(temp_filename)
-            print(f"  Downloaded {file_size} bytes")
-            
-            print("  Loading Whisper model...")
-            # Load Whisper model (downloads on first use)
-            # Set environment variable to bypass SSL for model downloads
-            os.environ['CURL_CA_BUNDLE'] = ''
-            os.environ['REQUESTS_CA_BUNDLE'] = ''
-            
-            try:
-                model = whisper.load_model("base")  # Options: tiny, base, small, medium, large
-            except Exception as model_error:
-                print(f"  Error loading Whisper model: {model_error}")
-                print("  This might be a first-run model download issue.")
-                print("  Try running this command separately first:")
-                print("  python -c \"import whisper; whisper.load_model('base')\"")
-                os.unlink(temp_filename)
-                return None
-            
-            print("  Transcribing audio...")
-            # Transcribe
-            result = model.transcribe(temp_filename)
-            
-            # Clean up temp file
-            os.unlink(temp_filename)
-            
-            return result["text"]
-            
-        except ImportError:
-            print("  Whisper not installed. Install with: pip install openai-whisper")
-            print("  Note: This also requires ffmpeg to be installed on your system")
-            return None
-        except Exception as e:
-            print(f"  Error during transcription: {e}")
-            # Clean up temp file if it exists
-            if 'temp_filename' in locals() and temp_filename and os.path.exists(temp_filename):
-                os.unlink(temp_filename)
-            return None
+                    if stage == 'audio' and result is not None:
+                        future = cpu_pool.submit(self._transcribe_stage, result, audio_slots, scheduler)
+                        pending[future] = (episode_data, 'transcribe')
+                        continue
+                    
+                    if result is EpisodeScheduler.DEFERRED:
+                        self._record_deferred(episode_data, state_store)
+                        deferred_downloads += 1
+                        continue
+                    
+                    transcript = result if stage != 'audio' else None
+                    saved = self.save_transcript(episode_data, transcript,
+                                                 episode_data.get('output_dir') or output_dir)
+                    if state_store is not None:
+                        self._record_result(episode_data, output_dir, state_store, saved)
+                    if saved:
+                        successful_downloads += 1
+                    else:
+                        failed_downloads += 1
+        
+        if skipped_downloads:
+            print(f"Skipped {skipped_downloads} episodes already transcribed")
+        if deferred_downloads:
+            print(f"Deferred {deferred_downloads} transcriptions to a later run (budget exhausted)")
+        return successful_downloads, failed_downloads + deferred_downloads, skipped_downloads
     
-    def download_all_transcripts(self, apple_podcast_url, output_dir="transcripts"):
-        """Main method to download all available transcripts"""
+    def download_all_transcripts(self, apple_podcast_url, output_dir="transcripts",
+                                 io_workers=4, cpu_workers=1, resume=True, stream_feed=False,
+                                 incremental=False, scheduler=None):
+        """Main method to download all available transcripts
+        
+        With ``resume`` enabled, progress is kept in a SQLite state store in
+        ``output_dir`` so re-runs only process new or previously failed episodes.
+        With ``stream_feed`` the RSS feed is parsed incrementally and episodes
+        start processing while the rest of it is still downloading.
+        ``incremental`` (requires ``resume``) stops at the newest episode of
+        the previous sync, so a daily refresh only touches new episodes;
+        failures from earlier runs are retried by a full run. An
+        ``EpisodeScheduler`` can reorder the work and bound Whisper time.
+        """
         
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
@@ -327,56 +3386,451 @@ class PodcastTranscriptDownloader:
         
         print(f"RSS Feed URL: {feed_url}")
         
-        feed = self.get_rss_feed(feed_url)
-        if not feed:
-            return
-        
-        print(f"Found {len(feed.entries)} episodes")
-        
-        successful_downloads = 0
-        failed_downloads = 0
-        
-        for i, entry in enumerate(feed.entries, 1):
-            print(f"\nProcessing episode {i}/{len(feed.entries)}: {entry.title}")
-            
-            # Extract audio URL from entry
-            audio_url = None
-            if hasattr(entry, 'enclosures') and entry.enclosures:
-                audio_url = entry.enclosures[0].href
-            elif hasattr(entry, 'links'):
-                for link in entry.links:
-                    if link.get('type', '').startswith('audio/'):
-                        audio_url = link.href
-                        break
+        if stream_feed:
+            episodes = self.iter_rss_episodes(feed_url)
+        else:
+            feed = self.get_rss_feed(feed_url)
+            if not feed:
+                return
             
-            episode_data = {
-                'title': entry.title,
-                'link': entry.link,
-                'published': entry.get('published', ''),
-                'description': entry.get('summary', ''),
-                'audio_url': audio_url,
-            }
+            print(f"Found {len(feed.entries)} episodes")
             
-            if audio_url:
-                print(f"  Found audio URL: {audio_url[:50]}...")
-            else:
-                print("  No audio URL found")
+            episodes = [self.extract_episode_data(entry) for entry in feed.entries]
+        
+        state_store = None
+        if resume:
+            state_store = EpisodeStateStore(os.path.join(output_dir, EpisodeStateStore.FILENAME))
+        elif incremental:
+            print("Incremental sync needs the state store; processing the whole feed")
+        try:
+            sync = {}
+            if state_store is not None and incremental:
+                mark = state_store.high_water_mark(feed_url)
+                if mark:
+                    print(f"Incremental sync: stopping at episode {mark['guid'] or mark['published']}")
+                episodes = self.episodes_since(episodes, mark, sync)
             
-            if self.download_transcript(episode_data, output_dir):
-                successful_downloads += 1
-            else:
-                failed_downloads += 1
+            successful_downloads, failed_downloads, skipped_downloads = self.process_episodes(
+                episodes, output_dir, io_workers=io_workers, cpu_workers=cpu_workers,
+                state_store=state_store, scheduler=scheduler)
             
-            # Be respectful with requests
-            time.sleep(1)
+            if state_store is not None and incremental:
+                self._advance_high_water_mark(state_store, feed_url, sync)
+        finally:
+            if state_store is not None:
+                state_store.close()
         
         print(f"\nDownload complete!")
         print(f"Successful: {successful_downloads}")
         print(f"Failed: {failed_downloads}")
+        print(f"Skipped (already done): {skipped_downloads}")
+
+    def podcast_dirname(self, podcast_id, podcast_info):
+        """Directory name for one podcast's transcripts in batch mode"""
+        safe_name = re.sub(r'[^\w\s-]', '', podcast_info.get('collectionName') or '')
+        safe_name = re.sub(r'[-\s]+', '-', safe_name).strip('-')
+        return f"{safe_name}-{podcast_id}" if safe_name else podcast_id
+    
+    def _batch_episodes(self, podcasts_info, output_dir, stream_feed, mark_store, marks):
+        """Yield the episodes of every podcast, tagged with their output directory and feed URL"""
+        for podcast_id, podcast_info in podcasts_info.items():
+            feed_url = podcast_info.get('feedUrl')
+            if not feed_url:
+                print(f"No RSS feed URL for podcast {podcast_id}, skipping")
+                continue
+            
+            podcast_dir = os.path.join(output_dir, self.podcast_dirname(podcast_id, podcast_info))
+            print(f"\nPodcast: {podcast_info.get('collectionName', 'Unknown')} ({podcast_id})")
+            try:
+                if stream_feed:
+                    episodes = self.iter_rss_episodes(feed_url)
+                else:
+                    feed = self.get_rss_feed(feed_url)
+                    if not feed:
+                        continue
+                    episodes = (self.extract_episode_data(entry) for entry in feed.entries)
+                
+                if mark_store is not None:
+                    episodes = self.episodes_since(episodes, mark_store.high_water_mark(feed_url),
+                                                   marks.setdefault(feed_url, {}))
+                
+                for episode_data in episodes:
+                    episode_data['output_dir'] = podcast_dir
+                    episode_data['feed_url'] = feed_url
+                    yield episode_data
+            except Exception as e:
+                # One broken feed shouldn't stop the rest of the catalog
+                print(f"Error reading feed {feed_url}: {e}")
+    
+    def download_batch(self, podcasts, output_dir="transcripts", io_workers=8, cpu_workers=1,
+                       resume=True, stream_feed=False, incremental=False, scheduler=None):
+        """Download transcripts for many podcasts through one shared pipeline
+        
+        ``podcasts`` is a list of Apple Podcasts URLs and/or ids, resolved with
+        batched iTunes lookups. Episodes of all podcasts are drained through a
+        single ``process_episodes`` run, so ``io_workers``, ``cpu_workers`` and
+        the per-host rate limits apply to the whole batch rather than per show.
+        Each podcast's transcripts go to its own subdirectory of ``output_dir``;
+        progress for all of them is kept in one state store at the top level.
+        With an ``EpisodeScheduler`` the priorities apply across all shows.
+        Returns (successful, failed, skipped).
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        
+        podcasts_info = self.get_podcasts_info(podcasts)
+        print(f"Resolved {len(podcasts_info)} podcasts")
+        
+        state_store = None
+        if resume:
+            state_store = EpisodeStateStore(os.path.join(output_dir, EpisodeStateStore.FILENAME))
+        elif incremental:
+            print("Incremental sync needs the state store; processing whole feeds")
+        try:
+            marks = {}
+            episodes = self._batch_episodes(podcasts_info, output_dir, stream_feed,
+                                            state_store if incremental else None, marks)
+            successful_downloads, failed_downloads, skipped_downloads = self.process_episodes(
+                episodes, output_dir, io_workers=io_workers, cpu_workers=cpu_workers,
+                state_store=state_store, scheduler=scheduler)
+            
+            for feed_url, sync in marks.items():
+                self._advance_high_water_mark(state_store, feed_url, sync)
+        finally:
+            if state_store is not None:
+                state_store.close()
+        
+        print(f"\nBatch complete!")
+        print(f"Podcasts: {len(podcasts_info)}")
+        print(f"Successful: {successful_downloads}")
+        print(f"Failed: {failed_downloads}")
+        print(f"Skipped (already done): {skipped_downloads}")
+        return successful_downloads, failed_downloads, skipped_downloads
+
+    def enqueue_episodes(self, job_queue, podcasts, stream_feed=False, batch_size=500):
+        """Coordinator side of distributed mode: queue one job per episode
+        
+        ``podcasts`` are resolved like ``download_batch``; each job carries the
+        episode's title, link, audio URL and published transcripts plus the
+        show's subdirectory, and is keyed like the state store (feed URL plus
+        GUID) so enqueueing the same shows again only adds new episodes while
+        episodes of different shows never collide. Returns the number of jobs
+        added.
+        """
+        podcasts_info = self.get_podcasts_info(podcasts)
+        print(f"Resolved {len(podcasts_info)} podcasts")
+        
+        added = 0
+        batch = []
+        for episode_data in self._batch_episodes(podcasts_info, '', stream_feed, None, {}):
+            batch.append({
+                'key': EpisodeStateStore.episode_key(episode_data),
+                'guid': episode_data.get('guid'),
+                'title': episode_data.get('title'),
+                'link': episode_data.get('link'),
+                'published': episode_data.get('published'),
+                'audio_url': episode_data.get('audio_url'),
+                'transcripts': episode_data.get('transcripts') or [],
+                'output_subdir': episode_data.get('output_dir'),
+                'feed_url': episode_data.get('feed_url'),
+            })
+            if len(batch) >= batch_size:
+                added += job_queue.put_many(batch)
+                batch = []
+        if batch:
+            added += job_queue.put_many(batch)
+        
+        print(f"\nQueued {added} new episode jobs")
+        print(f"Queue: {job_queue.counts()}")
+        return added
+    
+    def run_queue_worker(self, job_queue, output_dir="transcripts", worker_id=None, lease_seconds=300,
+                         poll_interval=5, exit_when_empty=False, max_jobs=None):
+        """Worker side of distributed mode: claim and process jobs until stopped
+        
+        Each job is leased for ``lease_seconds`` and a heartbeat thread renews
+        the lease every third of that while the episode is processed, so a
+        crashed worker's job is picked up by another one once its lease runs
+        out. Transcripts are saved under ``output_dir`` in the job's show
+        subdirectory. Returns the number of jobs processed.
+        """
+        import socket
+        import uuid
+        
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        print(f"Worker {worker_id} waiting for jobs")
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            claimed = job_queue.claim(worker_id, lease_seconds)
+            if claimed is None:
+                if exit_when_empty:
+                    break
+                time.sleep(poll_interval)
+                continue
+            
+            job_id, job = claimed
+            self._run_queue_job(job_queue, job_id, job, worker_id, output_dir, lease_seconds)
+            processed += 1
+        
+        print(f"Worker {worker_id} processed {processed} jobs")
+        return processed
+    
+    def _fetch_job_transcript(self, job):
+        """Transcript for a queued episode, or None if no source has one
+        
+        Raises IOError when a source couldn't be reached or the audio
+        couldn't be downloaded and transcribed, so the job is retried rather
+        than given up on.
+        """
+        errors = []
+        transcript = self.fetch_transcript_content(job, errors=errors)
+        if transcript:
+            return transcript
+        
+        if self._wants_audio(job):
+            raise IOError("audio download or transcription failed")
+        if errors:
+            raise IOError(f"transcript source unavailable: {errors[-1]}")
+        return None
+    
+    def _run_queue_job(self, job_queue, job_id, job, worker_id, output_dir, lease_seconds):
+        """Process one claimed job while keeping its lease alive"""
+        stop = threading.Event()
+        
+        def heartbeat():
+            while not stop.wait(lease_seconds / 3):
+                if not job_queue.heartbeat(job_id, worker_id, lease_seconds):
+                    print(f"  Lost the lease on job {job_id}")
+                    return
+        
+        thread = threading.Thread(target=heartbeat, name=f"heartbeat-{job_id}", daemon=True)
+        thread.start()
+        try:
+            print(f"\nJob {job_id}: {job.get('title')}")
+            transcript = self._fetch_job_transcript(job)
+            job_dir = os.path.join(output_dir, job.get('output_subdir') or '')
+            if self.save_transcript(job, transcript, job_dir):
+                job_queue.complete(job_id, worker_id)
+            else:
+                # Every source was reachable and none had a transcript
+                job_queue.fail(job_id, worker_id, "no transcript available", retry=False)
+        except Exception as e:
+            print(f"  Error processing job {job_id}: {e}")
+            job_queue.fail(job_id, worker_id, str(e))
+        finally:
+            stop.set()
+            thread.join()
+
+class TranscriptionServer(ThreadingHTTPServer):
+    """Long-lived local transcription worker shared by downloader processes.
+
+    Loads ``num_models`` copies of one Whisper model up front and serves
+    ``POST /transcribe`` jobs over localhost HTTP, each job borrowing a model
+    from the pool for its duration, so several downloader processes on one
+    box share warmed-up models instead of each loading their own. Jobs are
+    either JSON ``{"path": ...}`` naming an audio file on this machine, or a
+    raw ``application/octet-stream`` body of mono 16 kHz float32 samples.
+    ``GET /health`` reports the model and how many copies are busy.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, model_name="base", num_models=1, backend=None):
+        super().__init__(address, TranscriptionRequestHandler)
+        self.backend = backend or OpenAIWhisperBackend()
+        if not self.backend.available():
+            self.server_close()
+            raise ImportError(f"{self.backend.name} is not installed")
+
+        self.model_name = model_name
+        self.num_models = max(1, num_models)
+        self.models = queue.Queue()
+        self.busy = 0
+        self._busy_lock = threading.Lock()
+        
+        # Fix SSL issues for Whisper model downloads
+        ssl._create_default_https_context = ssl._create_unverified_context
+        for i in range(self.num_models):
+            print(f"Loading {self.backend.name} model '{model_name}' ({i + 1}/{self.num_models})...")
+            self.models.put(self.backend.load_model(model_name))
+
+    def transcribe(self, audio):
+        model = self.models.get()
+        with self._busy_lock:
+            self.busy += 1
+        try:
+            return self.backend.transcribe(model, audio)["text"]
+        finally:
+            with self._busy_lock:
+                self.busy -= 1
+            self.models.put(model)
+
+class TranscriptionRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for TranscriptionServer"""
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'error': 'not found'})
+            return
+        server = self.server
+        self._send_json(200, {'model': server.model_name, 'models': server.num_models, 'busy': server.busy})
+
+    def do_POST(self):
+        if self.path != '/transcribe':
+            self._send_json(404, {'error': 'not found'})
+            return
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length < 0:
+                raise ValueError(f"negative Content-Length {length}")
+            body = self.rfile.read(length)
+            if self.headers.get('Content-Type', '').startswith('application/json'):
+                job = json.loads(body)
+                requested_model = job.get('model')
+                audio = job['path']
+                if not os.path.isfile(audio):
+                    self._send_json(400, {'error': f"no such file: {audio}"})
+                    return
+            else:
+                import numpy as np
+                requested_model = self.headers.get('X-Whisper-Model')
+                audio = np.frombuffer(body, np.float32)
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {'error': f"bad request: {e}"})
+            return
+        
+        if requested_model and requested_model != self.server.model_name:
+            self._send_json(409, {'error': f"server runs model '{self.server.model_name}', not '{requested_model}'"})
+            return
+        
+        try:
+            text = self.server.transcribe(audio)
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+        self._send_json(200, {'text': text, 'model': self.server.model_name})
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"[transcription-server] {self.address_string()} {format % args}")
+
+def serve_transcription_worker(host="127.0.0.1", port=8765, model_name="base", num_models=1,
+                               backend="openai-whisper"):
+    """Run a TranscriptionServer until interrupted"""
+    backend = get_transcription_backend(backend) if isinstance(backend, str) else backend
+    try:
+        server = TranscriptionServer((host, port), model_name, num_models, backend)
+    except ImportError:
+        print(f"{backend.name} not installed. Install with: {backend.install_hint}")
+        return
+    print(f"Transcription server listening on http://{host}:{port} with {num_models} x '{model_name}'")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def parse_args(argv=None):
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Download transcripts for Apple Podcasts episodes")
+    parser.add_argument('--model', default="base", help="Whisper model size (tiny, base, small, medium, large)")
+    parser.add_argument('--backend', default="openai-whisper", choices=sorted(TRANSCRIPTION_BACKENDS),
+                        help="transcription engine (default: openai-whisper)")
+    parser.add_argument('--transcription-server', metavar='URL',
+                        help="send transcription jobs to a running --serve worker, e.g. http://127.0.0.1:8765")
+    parser.add_argument('--serve', action='store_true',
+                        help="run a shared transcription worker instead of downloading")
+    parser.add_argument('--host', default="127.0.0.1", help="address for --serve (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="port for --serve (default: 8765)")
+    parser.add_argument('--models', type=int, default=1, help="preloaded model copies for --serve (default: 1)")
+    parser.add_argument('--stream-feed', action='store_true',
+                        help="parse the RSS feed incrementally instead of loading it whole")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only process episodes published since the previous run")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="non-interactive: process every Apple Podcasts URL or id listed in FILE (one per line)")
+    parser.add_argument('--output', default="transcripts", help="output directory for --batch and --worker (default: transcripts)")
+    parser.add_argument('--io-workers', type=int, default=8,
+                        help="concurrent page/audio fetches for --batch (default: 8)")
+    parser.add_argument('--cpu-workers', type=int, default=1,
+                        help="concurrent transcriptions for --batch (default: 1)")
+    parser.add_argument('--queue', metavar='URL',
+                        help="job queue for distributed mode: a SQLite file path (workers on this host) "
+                             "or redis://host:port/db (workers on several hosts)")
+    parser.add_argument('--enqueue', metavar='FILE',
+                        help="coordinator: queue the episodes of every podcast listed in FILE on --queue")
+    parser.add_argument('--worker', action='store_true',
+                        help="worker: process jobs from --queue, saving transcripts under --output")
+    parser.add_argument('--worker-id', help="name of this worker (default: host-pid-random)")
+    parser.add_argument('--lease', type=float, default=300,
+                        help="seconds a claimed job stays leased between heartbeats (default: 300)")
+    parser.add_argument('--exit-when-empty', action='store_true',
+                        help="stop the worker once the queue is empty instead of polling")
+    parser.add_argument('--priority', metavar='CRITERIA',
+                        help="comma-separated episode order, e.g. cheap,newest (criteria: %s); "
+                             "Whisper jobs run after all other work" % ', '.join(EpisodeScheduler.CRITERIA))
+    parser.add_argument('--whisper-budget', type=float, metavar='SECONDS',
+                        help="stop starting transcriptions after this much total transcription time")
+    parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                        help="stop starting transcriptions this long after the run starts")
+    return parser.parse_args(argv)
 
 def main():
     """Example usage"""
-    downloader = PodcastTranscriptDownloader()
+    args = parse_args()
+    if args.serve:
+        serve_transcription_worker(args.host, args.port, args.model, args.models, args.backend)
+        return
+    
+    downloader = PodcastTranscriptDownloader(whisper_model=args.model, backend=args.backend,
+                                             transcription_server=args.transcription_server)
+    
+    scheduler = None
+    if args.priority or args.whisper_budget is not None or args.deadline is not None:
+        priority = [criterion.strip() for criterion in (args.priority or "cheap,newest").split(',') if criterion.strip()]
+        try:
+            scheduler = EpisodeScheduler(priority, cpu_budget=args.whisper_budget, deadline=args.deadline)
+        except ValueError as e:
+            print(e)
+            return
+    
+    if args.enqueue or args.worker:
+        if not args.queue:
+            print("--enqueue and --worker need --queue")
+            return
+        try:
+            job_queue = open_job_queue(args.queue)
+        except ImportError as e:
+            print(e)
+            return
+        try:
+            if args.enqueue:
+                with open(args.enqueue, encoding='utf-8') as f:
+                    podcasts = [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+                downloader.enqueue_episodes(job_queue, podcasts, stream_feed=args.stream_feed)
+            else:
+                downloader.run_queue_worker(job_queue, args.output, worker_id=args.worker_id,
+                                            lease_seconds=args.lease, exit_when_empty=args.exit_when_empty)
+        finally:
+            job_queue.close()
+        return
+    
+    if args.batch:
+        with open(args.batch, encoding='utf-8') as f:
+            podcasts = [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+        downloader.download_batch(podcasts, args.output, io_workers=args.io_workers,
+                                  cpu_workers=args.cpu_workers, stream_feed=args.stream_feed,
+                                  incremental=args.incremental, scheduler=scheduler)
+        return
     
     # Example URL - replace with actual Apple Podcasts URL
     podcast_url = input("Enter Apple Podcasts URL: ").strip()
@@ -389,7 +3843,8 @@ def main():
     if not output_directory:
         output_directory = "transcripts"
     
-    downloader.download_all_transcripts(podcast_url, output_directory)
+    downloader.download_all_transcripts(podcast_url, output_directory, stream_feed=args.stream_feed,
+                                        incremental=args.incremental, scheduler=scheduler)
 
 if __name__ == "__main__":
     # Required dependencies
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+import requests
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the code under test, streaming included"""
+
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.text = content.decode('utf-8', 'replace')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        # Small chunks, so streaming parsers see items split across reads
+        for start in range(0, len(self.content), 16):
+            yield self.content[start:start + 16]
+
+
+@pytest.fixture
+def fake_response():
+    """Factory for fake responses: fake_response(status_code, content=b'', headers=None)"""
+    return FakeResponse
@@ -0,0 +1,58 @@
+import asyncio
+import http.server
+import threading
+
+import pytest
+
+import podcast_transcripts as pt
+
+pytest.importorskip('aiohttp')
+
+FEED = b"""<?xml version="1.0"?>
+<rss><channel><title>Show</title>
+<item><title>One</title><guid>g1</guid></item>
+</channel></rss>"""
+
+
+class FeedHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml')
+        self.send_header('Content-Length', str(len(FEED)))
+        self.end_headers()
+        self.wfile.write(FEED)
+
+
+@pytest.fixture
+def feed_url():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/feed"
+    server.shutdown()
+    server.server_close()
+
+
+def test_each_event_loop_gets_its_own_session(tmp_path, feed_url):
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path), requests_per_second=0)
+
+    async def fetch():
+        feed = await downloader.get_rss_feed_async(feed_url, use_cache=False)
+        return feed, await downloader._get_async_session()
+
+    # Separate asyncio.run calls, as a CLI or a sync wrapper would make them
+    first_feed, first_session = asyncio.run(fetch())
+    second_feed, second_session = asyncio.run(fetch())
+
+    assert [entry.id for entry in first_feed.entries] == ['g1']
+    assert [entry.id for entry in second_feed.entries] == ['g1']
+    assert first_session is not second_session
+
+    async def fetch_and_close():
+        await downloader._get_async_session()
+        await downloader.aclose()
+
+    asyncio.run(fetch_and_close())
@@ -0,0 +1,242 @@
+import asyncio
+import hashlib
+import http.server
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import podcast_transcripts as pt
+
+AUDIO = bytes(range(256)) * 4096  # 1 MiB
+
+
+class AudioHandler(http.server.BaseHTTPRequestHandler):
+    """Serves AUDIO at /audio.mp3 (honouring Range + If-Range) and 404 elsewhere
+
+    The first ``drops`` responses are cut off after a third of the body, and
+    bodies are sent in 64 KiB pieces ``chunk_delay`` seconds apart. With
+    ``accept_ranges`` the server advertises byte ranges; ``range_drops``
+    cuts off that many range responses, and ``ignore_ranges`` answers range
+    requests with the whole file.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        byte_range = self.headers.get('Range')
+        with server.lock:
+            server.requests.append((self.path, byte_range))
+        if not self.path.startswith('/audio.mp3'):
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        ranged = byte_range and self.headers.get('If-Range') == '"v1"' and not server.ignore_ranges
+        if ranged:
+            first, last = byte_range.split('=')[1].split('-')
+            start, end = int(first), int(last) if last else len(AUDIO) - 1
+            body = AUDIO[start:end + 1]
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{end}/{len(AUDIO)}")
+        else:
+            body = AUDIO
+            self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        if server.accept_ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+
+        with server.lock:
+            if ranged and server.range_drops > 0:
+                server.range_drops -= 1
+                drop = True
+            else:
+                drop = not server.accept_ranges and server.drops > 0
+                server.drops -= 1
+        if drop:
+            body = body[:len(body) // 3]
+            self.close_connection = True
+        try:
+            for start in range(0, len(body), 65536):
+                self.wfile.write(body[start:start + 65536])
+                self.wfile.flush()
+                time.sleep(server.chunk_delay)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client only wanted the headers
+            pass
+
+
+@pytest.fixture
+def audio_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), AudioHandler)
+    server.requests = []
+    server.drops = 0
+    server.chunk_delay = 0
+    server.accept_ranges = False
+    server.range_drops = 0
+    server.ignore_ranges = False
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def downloader(tmp_path, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(pt.time, 'sleep', sleeps.append)
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path), requests_per_second=0,
+                                                range_download_parts=1)
+    downloader.sleeps = sleeps
+    return downloader
+
+
+def url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def test_interrupted_download_resumes_with_range(audio_server, downloader):
+    audio_server.drops = 2
+    path = downloader.download_audio(url(audio_server, '/audio.mp3'))
+    assert digest(path) == hashlib.md5(AUDIO).hexdigest()
+    ranges = [byte_range for _, byte_range in audio_server.requests]
+    assert ranges[0] is None
+    assert all(byte_range and byte_range.startswith('bytes=') for byte_range in ranges[1:])
+
+
+def test_async_download_shares_resume_and_cache(audio_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(pt.time, 'sleep', lambda seconds: None)
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path), requests_per_second=0,
+                                                range_download_parts=1, audio_cache_bytes=2 * 1024 ** 3)
+    audio_server.drops = 1
+    audio_url = url(audio_server, '/audio.mp3')
+    path = asyncio.run(downloader.download_audio_async(audio_url))
+    assert digest(path) == hashlib.md5(AUDIO).hexdigest()
+    assert audio_server.requests[1][1].startswith('bytes=')
+    downloader.release_audio(path)
+    # Served from the audio cache the second time, after checking the ETag
+    assert asyncio.run(downloader.download_audio_async(audio_url)) == path
+    assert [byte_range for _, byte_range in audio_server.requests[2:]] == [None]
+
+
+def test_permanent_errors_are_not_retried(audio_server, downloader):
+    assert downloader.download_audio(url(audio_server, '/missing.mp3')) is None
+    assert downloader.sleeps == []
+    # One requests attempt plus the urllib fallback
+    assert len(audio_server.requests) == 2
+
+
+def test_concurrent_downloads_of_one_enclosure(audio_server, downloader):
+    audio_server.drops = 1
+    results = []
+
+    def download():
+        results.append(downloader.download_audio(url(audio_server, '/audio.mp3')))
+
+    threads = [threading.Thread(target=download) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 3
+    assert all(digest(path) == hashlib.md5(AUDIO).hexdigest() for path in results)
+
+
+def download_digest(cache_dir, audio_url):
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=cache_dir, requests_per_second=0,
+                                                range_download_parts=1, download_retries=5)
+    pt.time.sleep = lambda seconds: None
+    path = downloader.download_audio(audio_url)
+    return digest(path) if path else None
+
+
+def test_processes_sharing_a_cache_dir_take_turns(audio_server, tmp_path):
+    audio_server.drops = 3
+    audio_server.chunk_delay = 0.01
+    with ProcessPoolExecutor(3, mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = [pool.submit(download_digest, str(tmp_path), url(audio_server, '/audio.mp3'))
+                   for _ in range(3)]
+        digests = [future.result() for future in futures]
+    assert digests == [hashlib.md5(AUDIO).hexdigest()] * 3
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    """An 'ffmpeg' on PATH that passes its input through as PCM"""
+    pytest.importorskip('numpy')
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "ffmpeg"
+    script.write_text("#!/bin/sh\nexec cat\n")
+    script.chmod(0o755)
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+
+@pytest.mark.parametrize('audio_cache_bytes, cached', [(None, False), (2 * 1024 ** 3, True)])
+def test_streamed_audio_is_cached_only_on_request(audio_server, fake_ffmpeg, tmp_path, audio_cache_bytes, cached):
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path / "cache"), requests_per_second=0,
+                                                audio_cache_bytes=audio_cache_bytes)
+    audio_url = url(audio_server, '/audio.mp3')
+    samples = downloader.stream_decode_audio(audio_url)
+    assert len(samples) == len(AUDIO) // 2
+
+    path = downloader.audio_cache.get(audio_url, '"v1"', str(len(AUDIO)))
+    assert bool(path) == cached
+
+
+@pytest.fixture
+def ranged_downloader(tmp_path, monkeypatch, audio_server):
+    monkeypatch.setattr(pt.time, 'sleep', lambda seconds: None)
+    audio_server.accept_ranges = True
+    return pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path), requests_per_second=0,
+                                          range_download_parts=4, range_download_threshold=len(AUDIO) // 2,
+                                          download_buffer=16 * 1024)
+
+
+def range_requests(server):
+    return sorted(byte_range for _, byte_range in server.requests if byte_range)
+
+
+def test_large_files_are_downloaded_as_parallel_ranges(audio_server, ranged_downloader):
+    path = ranged_downloader.download_audio(url(audio_server, '/audio.mp3'))
+    assert digest(path) == hashlib.md5(AUDIO).hexdigest()
+    quarter = len(AUDIO) // 4
+    assert range_requests(audio_server) == sorted(
+        f"bytes={start}-{start + quarter - 1}" for start in range(0, len(AUDIO), quarter))
+
+
+def test_dropped_range_resumes_where_it_stopped(audio_server, ranged_downloader):
+    audio_server.range_drops = 1
+    path = ranged_downloader.download_audio(url(audio_server, '/audio.mp3'))
+    assert digest(path) == hashlib.md5(AUDIO).hexdigest()
+
+    requests = range_requests(audio_server)
+    assert len(requests) == 5
+    quarter = len(AUDIO) // 4
+    # The retry starts inside one of the four parts, not at its beginning
+    starts = {int(byte_range.split('=')[1].split('-')[0]) for byte_range in requests}
+    assert len([start for start in starts if start % quarter]) == 1
+
+
+def test_server_ignoring_ranges_falls_back_to_one_stream(audio_server, ranged_downloader):
+    audio_server.ignore_ranges = True
+    path = ranged_downloader.download_audio(url(audio_server, '/audio.mp3'))
+    assert digest(path) == hashlib.md5(AUDIO).hexdigest()
+    # Initial request, the range requests answered with 200, then one plain GET
+    assert audio_server.requests[-1] == ('/audio.mp3', None)
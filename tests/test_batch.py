@@ -0,0 +1,53 @@
+import os
+
+import podcast_transcripts as pt
+
+SHOWS = {
+    '1': {'collectionName': 'Show A', 'feedUrl': 'https://a.example.com/feed'},
+    '2': {'collectionName': 'Show B', 'feedUrl': 'https://b.example.com/feed'},
+}
+
+
+class BatchDownloader(pt.PodcastTranscriptDownloader):
+    """Two shows whose episodes share GUIDs and titles; every episode has a published transcript"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fetched = []
+
+    def get_podcasts_info(self, podcasts, batch_size=None, use_cache=True):
+        return {podcast_id: SHOWS[podcast_id] for podcast_id in podcasts}
+
+    def iter_rss_episodes(self, feed_url, use_cache=True):
+        for guid in ('2', '1'):
+            yield {'guid': guid, 'title': f"Episode {guid}", 'link': '', 'published': '',
+                   'audio_url': None, 'transcripts': [{'url': f"{feed_url}/{guid}.txt"}]}
+
+    def fetch_published_transcript(self, transcripts, errors=None):
+        self.fetched.append(transcripts[0]['url'])
+        return f"text of {transcripts[0]['url']}"
+
+
+def run_batch(tmp_path):
+    downloader = BatchDownloader(cache_dir=str(tmp_path / "cache"))
+    result = downloader.download_batch(['1', '2'], str(tmp_path / "out"), io_workers=2, stream_feed=True)
+    return downloader, result
+
+
+def test_batch_writes_one_directory_per_show(tmp_path):
+    downloader, result = run_batch(tmp_path)
+
+    assert result == (4, 0, 0)
+    assert sorted(os.listdir(tmp_path / "out")) == [pt.EpisodeStateStore.FILENAME, 'Show-A-1', 'Show-B-2']
+    with open(tmp_path / "out" / "Show-B-2" / "Episode-1.txt", encoding='utf-8') as f:
+        assert f.read().endswith("text of https://b.example.com/feed/1.txt")
+
+
+def test_batch_state_keeps_shows_with_shared_guids_apart(tmp_path):
+    run_batch(tmp_path)
+    os.remove(tmp_path / "out" / "Show-B-2" / "Episode-1.txt")
+
+    downloader, result = run_batch(tmp_path)
+    # Only the deleted transcript is fetched again, not Show A's "1"
+    assert downloader.fetched == ['https://b.example.com/feed/1.txt']
+    assert result == (1, 0, 3)
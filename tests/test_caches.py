@@ -0,0 +1,88 @@
+import os
+
+import podcast_transcripts as pt
+
+
+def put(cache, tmp_path, name, age):
+    source = tmp_path / f"{name}.download"
+    source.write_bytes(b'x' * 100)
+    path = cache.put(f"https://example.com/{name}.mp3", None, '100', str(source))
+    # Deterministic LRU order: older files have older mtimes
+    os.utime(path, (age, age))
+    return path
+
+
+def test_eviction_skips_pinned_files(tmp_path):
+    cache = pt.AudioCache(str(tmp_path / "audio"), max_bytes=250)
+    a = put(cache, tmp_path, 'a', 1000)
+    b = put(cache, tmp_path, 'b', 2000)
+    cache.release(b)
+
+    # a is the least recently used file but still pinned, so b goes
+    c = put(cache, tmp_path, 'c', 3000)
+    assert os.path.exists(a) and os.path.exists(c)
+    assert not os.path.exists(b)
+
+    cache.release(a)
+    cache.release(c)
+    put(cache, tmp_path, 'd', 4000)
+    assert not os.path.exists(a) and os.path.exists(c)
+
+
+def test_get_pins_and_refreshes_a_file(tmp_path):
+    cache = pt.AudioCache(str(tmp_path / "audio"), max_bytes=250)
+    a = put(cache, tmp_path, 'a', 1000)
+    b = put(cache, tmp_path, 'b', 2000)
+    cache.release(a)
+    cache.release(b)
+
+    assert cache.get('https://example.com/a.mp3', None, '100') == a
+    assert cache.get('https://example.com/a.mp3', None, '101') is None
+    cache.release(a)
+    # Reading a made b the least recently used file
+    put(cache, tmp_path, 'c', 3000)
+    assert os.path.exists(a) and not os.path.exists(b)
+
+
+class CountingBackend(pt.TranscriptionBackend):
+    name = "counting"
+
+    def __init__(self):
+        self.calls = []
+
+    def available(self):
+        return True
+
+    def load_model(self, model_name):
+        return model_name
+
+    def transcribe(self, model, audio):
+        self.calls.append((model, audio))
+        with open(audio, 'rb') as f:
+            text = f"{model}: {f.read().decode()}"
+        return {'text': text, 'segments': [{'start': 0.0, 'end': 1.0, 'text': text}]}
+
+
+def audio_file(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_identical_audio_is_transcribed_once(tmp_path):
+    backend = CountingBackend()
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path / "cache"), backend=backend,
+                                                audio_cache_bytes=0)
+
+    first = downloader.transcribe_audio_result(audio_file(tmp_path, 'feed-a.mp3', b'same audio'), 'base')
+    # The same bytes under another feed's URL, in a later run
+    rerun = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path / "cache"), backend=backend,
+                                           audio_cache_bytes=0)
+    second = rerun.transcribe_audio_result(audio_file(tmp_path, 'feed-b.mp3', b'same audio'), 'base')
+    assert second == first
+    assert len(backend.calls) == 1
+
+    # Other audio, or other model settings, are transcribed again
+    rerun.transcribe_audio_result(audio_file(tmp_path, 'other.mp3', b'other audio'), 'base')
+    rerun.transcribe_audio_result(audio_file(tmp_path, 'feed-c.mp3', b'same audio'), 'small')
+    assert [model for model, _ in backend.calls] == ['base', 'base', 'small']
@@ -0,0 +1,101 @@
+import pytest
+
+import podcast_transcripts as pt
+
+np = pytest.importorskip('numpy')
+
+SAMPLE_RATE = pt.WHISPER_SAMPLE_RATE
+QUIET_SECOND = 14
+
+
+def encoded_audio(seconds):
+    """One distinct level per second; QUIET_SECOND is near-silent but still decodable"""
+    levels = [-(i + 1) / 10000 if i == QUIET_SECOND else (i + 1) / 100 for i in range(seconds)]
+    return np.repeat(np.array(levels, dtype=np.float32), SAMPLE_RATE)
+
+
+def decode_second(value):
+    return round(-value * 10000) - 1 if abs(value) < 0.01 else round(value * 100) - 1
+
+
+class SecondsBackend(pt.TranscriptionBackend):
+    """Transcribes every (partial) second of encoded audio as one word"""
+
+    def load_model(self, model_name):
+        return model_name
+
+    def transcribe(self, model, audio):
+        segments = []
+        for position in range(len(audio)):
+            if position and audio[position] == audio[position - 1]:
+                continue
+            segments.append({'start': position / SAMPLE_RATE, 'end': (position + 1) / SAMPLE_RATE,
+                             'text': f"w{decode_second(audio[position])}"})
+        return {'text': ' '.join(segment['text'] for segment in segments), 'segments': segments}
+
+
+def test_split_on_silence_cuts_in_the_quiet_second():
+    samples = encoded_audio(30)
+    windows = pt.split_on_silence(samples, chunk_seconds=12, overlap_seconds=5)
+
+    (first_start, cut), (second_start, end) = windows
+    assert first_start == 0 and end == len(samples)
+    assert QUIET_SECOND * SAMPLE_RATE <= cut < (QUIET_SECOND + 1) * SAMPLE_RATE
+    assert second_start == cut - 5 * SAMPLE_RATE
+
+
+def test_split_on_silence_keeps_short_audio_whole():
+    samples = encoded_audio(15)
+    assert pt.split_on_silence(samples, chunk_seconds=12) == [(0, len(samples))]
+
+
+def test_stitch_transcripts_drops_the_repeated_overlap():
+    texts = ["so today we talk about the weather in", "the weather in Paris, which is mild"]
+    assert pt.stitch_transcripts(texts) == "so today we talk about the weather in Paris, which is mild"
+
+
+def test_stitch_transcripts_matches_despite_case_and_punctuation():
+    texts = ["and that is why we. Left the", "we left the city early"]
+    assert pt.stitch_transcripts(texts) == "and that is why we left the city early"
+
+
+def test_stitch_transcripts_concatenates_without_a_long_enough_match():
+    assert pt.stitch_transcripts(["one two three", "three four five"]) == "one two three three four five"
+
+
+def test_speech_map_maps_compressed_times_back():
+    speech_map = pt.SpeechMap([(16000, 32000), (24000, 48000), (80000, 96000)])
+    # Overlapping padding is merged away
+    assert speech_map.regions == [(16000, 32000), (32000, 48000), (80000, 96000)]
+    assert speech_map.length == 48000
+
+    samples = np.arange(100000, dtype=np.float32)
+    compressed = speech_map.compress(samples)
+    assert len(compressed) == speech_map.length
+    assert compressed[32000] == 80000
+
+    assert speech_map.to_original(0) == 1.0
+    assert speech_map.to_original(1.5) == 2.5
+    assert speech_map.to_original(2.5) == 5.5
+    assert speech_map.remap_segments([{'start': 0.5, 'end': 2.25, 'text': 'hi'}]) == [
+        {'start': 1.5, 'end': 5.25, 'text': 'hi'}]
+
+
+def test_empty_speech_map_leaves_times_alone():
+    speech_map = pt.SpeechMap([])
+    assert speech_map.regions == [] and speech_map.length == 0
+    assert speech_map.to_original(3.0) == 3.0
+
+
+def test_chunked_transcription_on_spawned_workers(tmp_path):
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path), backend=SecondsBackend(),
+                                                chunk_workers=2, chunk_seconds=12)
+    try:
+        result = downloader._transcribe_in_chunks(encoded_audio(30), 'tiny')
+    finally:
+        downloader.shutdown_chunk_pool()
+
+    expected = [f"w{i}" for i in range(30)]
+    assert result['text'] == ' '.join(expected)
+    assert [segment['text'] for segment in result['segments']] == expected
+    assert [round(segment['start']) for segment in result['segments']] == list(range(30))
@@ -0,0 +1,141 @@
+import os
+
+import podcast_transcripts as pt
+
+
+MALFORMED_FEED = b"""<?xml version="1.0"?>
+<rss><channel><title>Show</title>
+<item><title>One&nbsp;two</title><guid>g1</guid></item>
+<item><title>Three</title><guid>g2</guid></item>
+</channel></rss>"""
+
+
+def test_malformed_feed_is_cached_and_replayed_on_304(tmp_path, fake_response):
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path))
+    responses = [fake_response(200, MALFORMED_FEED, {'ETag': '"v1"'}), fake_response(304)]
+    sent_headers = []
+
+    def fake_get(url, headers=None, **kwargs):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    downloader.session.get = fake_get
+
+    feed = downloader.get_rss_feed('https://example.com/feed')
+    assert feed.bozo
+    assert len(feed.entries) == 2
+
+    cached = downloader.get_rss_feed('https://example.com/feed')
+    assert sent_headers[1] == {'If-None-Match': '"v1"'}
+    assert [entry.id for entry in cached.entries] == ['g1', 'g2']
+
+
+def test_cache_write_errors_do_not_fail_the_fetch(tmp_path, monkeypatch, fake_response):
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path))
+    downloader.session.get = lambda url, headers=None, **kwargs: fake_response(
+        200, MALFORMED_FEED, {'ETag': '"v1"'})
+
+    def broken_write(path, data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pt, '_atomic_write', broken_write)
+    feed = downloader.get_rss_feed('https://example.com/feed')
+    assert len(feed.entries) == 2
+
+
+def feed_episodes(guids):
+    return [{'guid': guid, 'title': f"Episode {guid}", 'link': '', 'published': '',
+             'audio_url': None, 'transcripts': []} for guid in guids]
+
+
+class IncrementalDownloader(pt.PodcastTranscriptDownloader):
+    """Serves a fixed episode list as a streamed feed, optionally breaking off"""
+
+    def __init__(self, *args, guids=(), break_after=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.guids = guids
+        self.break_after = break_after
+
+    def get_podcast_info(self, podcast_id, use_cache=True):
+        return {'collectionName': 'Show', 'feedUrl': 'https://example.com/feed'}
+
+    def iter_rss_episodes(self, feed_url, use_cache=True):
+        for i, episode_data in enumerate(feed_episodes(self.guids)):
+            if i == self.break_after:
+                raise IOError("connection dropped")
+            yield episode_data
+
+    def _fetch_text_stage(self, episode_data, label):
+        return f"transcript {episode_data['guid']}"
+
+
+def run_incremental(tmp_path, guids, break_after=None):
+    downloader = IncrementalDownloader(cache_dir=str(tmp_path / "cache"), guids=guids,
+                                       break_after=break_after)
+    downloader.download_all_transcripts("https://podcasts.apple.com/us/podcast/x/id1",
+                                        str(tmp_path / "out"), stream_feed=True, incremental=True)
+    store = pt.EpisodeStateStore(str(tmp_path / "out" / pt.EpisodeStateStore.FILENAME))
+    try:
+        return store.high_water_mark('https://example.com/feed')
+    finally:
+        store.close()
+
+
+def test_high_water_mark_advances_after_a_complete_sync(tmp_path):
+    assert run_incremental(tmp_path, ['g2', 'g1'])['guid'] == 'g2'
+    assert run_incremental(tmp_path, ['g4', 'g3', 'g2', 'g1'])['guid'] == 'g4'
+
+
+def test_high_water_mark_kept_when_the_feed_breaks_off(tmp_path):
+    assert run_incremental(tmp_path, ['g2', 'g1'])['guid'] == 'g2'
+    # g5 and g4 are processed, the feed drops before g3
+    assert run_incremental(tmp_path, ['g5', 'g4', 'g3', 'g2'], break_after=2)['guid'] == 'g2'
+    # The next run still reaches g3
+    assert run_incremental(tmp_path, ['g5', 'g4', 'g3', 'g2'])['guid'] == 'g5'
+    assert (tmp_path / "out" / "Episode-g3.txt").exists()
+
+
+FEED = b"""<?xml version="1.0"?>
+<rss><channel><title>Show</title>
+<item><title>One</title><guid>g1</guid></item>
+<item><title>Two</title><guid>g2</guid></item>
+<item><title>Three</title><guid>g3</guid></item>
+</channel></rss>"""
+
+
+def streaming_downloader(tmp_path, responses, sent_headers):
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path))
+
+    def fake_get(url, headers=None, **kwargs):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    downloader.session.get = fake_get
+    return downloader
+
+
+def test_streamed_feed_is_cached_and_replayed_on_304(tmp_path, fake_response):
+    sent_headers = []
+    downloader = streaming_downloader(
+        tmp_path, [fake_response(200, FEED, {'ETag': '"v1"'}), fake_response(304)], sent_headers)
+
+    assert [e['guid'] for e in downloader.iter_rss_episodes('https://example.com/feed')] == ['g1', 'g2', 'g3']
+    assert [e['guid'] for e in downloader.iter_rss_episodes('https://example.com/feed')] == ['g1', 'g2', 'g3']
+    assert sent_headers[1] == {'If-None-Match': '"v1"'}
+
+
+def test_partly_read_stream_keeps_the_previous_cache_entry(tmp_path, fake_response):
+    sent_headers = []
+    downloader = streaming_downloader(
+        tmp_path, [fake_response(200, FEED, {'ETag': '"v1"'}),
+                   fake_response(200, FEED.replace(b'g1', b'g0'), {'ETag': '"v2"'}),
+                   fake_response(304)], sent_headers)
+
+    list(downloader.iter_rss_episodes('https://example.com/feed'))
+    episodes = downloader.iter_rss_episodes('https://example.com/feed')
+    assert next(episodes)['guid'] == 'g0'
+    episodes.close()
+
+    assert [e['guid'] for e in downloader.iter_rss_episodes('https://example.com/feed')] == ['g1', 'g2', 'g3']
+    assert sent_headers[2] == {'If-None-Match': '"v1"'}
+    assert not [name for name in os.listdir(tmp_path / 'feeds') if name.endswith('.tmp')]
@@ -0,0 +1,149 @@
+import time
+
+import pytest
+
+import podcast_transcripts as pt
+
+
+@pytest.fixture(params=['sqlite', 'redis'])
+def make_queue(request, tmp_path):
+    def make(max_attempts=3):
+        if request.param == 'sqlite':
+            return pt.open_job_queue(str(tmp_path / f"jobs-{time.monotonic_ns()}.sqlite3"),
+                                     max_attempts=max_attempts)
+        fakeredis = pytest.importorskip('fakeredis')
+        return pt.RedisJobQueue(fakeredis.FakeRedis(decode_responses=True), max_attempts=max_attempts)
+    return make
+
+
+def job(key):
+    return {'key': key, 'title': f"Episode {key}", 'link': '', 'audio_url': None}
+
+
+def test_put_skips_known_keys(make_queue):
+    queue = make_queue()
+    assert queue.put_many([job('a'), job('b')]) == 2
+    assert queue.put_many([job('a'), job('c')]) == 1
+    assert queue.counts()['pending'] == 3
+
+
+def test_expired_lease_is_reclaimed(make_queue):
+    queue = make_queue()
+    queue.put(job('a'))
+    job_id, _ = queue.claim('crashed', lease_seconds=0.05)
+    assert queue.claim('other', lease_seconds=0.05) is None
+
+    time.sleep(0.1)
+    claimed_id, claimed = queue.claim('other', lease_seconds=60)
+    assert claimed_id == job_id
+    assert claimed['title'] == "Episode a"
+
+
+def test_heartbeat_keeps_the_lease(make_queue):
+    queue = make_queue()
+    queue.put(job('a'))
+    job_id, _ = queue.claim('worker', lease_seconds=0.1)
+    for _ in range(3):
+        time.sleep(0.05)
+        assert queue.heartbeat(job_id, 'worker', lease_seconds=0.1)
+    assert queue.claim('other') is None
+
+
+def test_job_fails_after_max_attempts(make_queue):
+    queue = make_queue(max_attempts=2)
+    queue.put(job('a'))
+    for worker in ('first', 'second'):
+        assert queue.claim(worker, lease_seconds=0.05) is not None
+        time.sleep(0.1)
+    assert queue.claim('third') is None
+    assert queue.counts()['failed'] == 1
+
+
+def test_retry_and_permanent_failures(make_queue):
+    queue = make_queue(max_attempts=2)
+    queue.put(job('a'))
+    job_id, _ = queue.claim('worker')
+    assert queue.fail(job_id, 'worker', "timeout")
+    job_id, _ = queue.claim('worker')
+    assert queue.fail(job_id, 'worker', "timeout")
+    # Out of attempts
+    assert queue.claim('worker') is None
+    assert queue.counts()['failed'] == 1
+
+    queue.put(job('b'))
+    job_id, _ = queue.claim('worker')
+    assert queue.fail(job_id, 'worker', "no transcript", retry=False)
+    assert queue.claim('worker') is None
+    assert queue.counts()['failed'] == 2
+
+
+def test_stale_owner_cannot_complete_or_fail(make_queue):
+    queue = make_queue()
+    queue.put(job('a'))
+    job_id, _ = queue.claim('stale', lease_seconds=0.05)
+    time.sleep(0.1)
+    assert queue.claim('current', lease_seconds=60)[0] == job_id
+
+    assert not queue.complete(job_id, 'stale')
+    assert not queue.fail(job_id, 'stale', "late error")
+    assert not queue.heartbeat(job_id, 'stale')
+    # The new holder's lease is untouched and nothing was requeued
+    assert queue.heartbeat(job_id, 'current')
+    assert queue.claim('another') is None
+
+    assert queue.complete(job_id, 'current')
+    assert queue.counts()['done'] == 1
+
+
+class QueueWorkerDownloader(pt.PodcastTranscriptDownloader):
+    def __init__(self, *args, page_error=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.page_error = page_error
+
+    def transcription_available(self):
+        return False
+
+    def check_existing_transcript(self, episode_url, errors=None):
+        if self.page_error and errors is not None:
+            errors.append(self.page_error)
+        return None
+
+
+def test_worker_retries_transport_errors_only(make_queue, tmp_path):
+    queue = make_queue(max_attempts=3)
+    queue.put(job('a'))
+    downloader = QueueWorkerDownloader(cache_dir=str(tmp_path / "cache"), page_error=IOError("503"))
+    # Retried until the attempts run out
+    assert downloader.run_queue_worker(queue, str(tmp_path / "out"), worker_id='w',
+                                       exit_when_empty=True) == 3
+    counts = queue.counts()
+    assert counts['failed'] == 1 and not counts.get('done')
+
+    queue = make_queue(max_attempts=3)
+    queue.put(job('b'))
+    downloader = QueueWorkerDownloader(cache_dir=str(tmp_path / "cache"))
+    # No source has a transcript: given up on after one attempt
+    assert downloader.run_queue_worker(queue, str(tmp_path / "out"), worker_id='w',
+                                       exit_when_empty=True) == 1
+    assert queue.counts()['failed'] == 1
+
+
+class TwoShowDownloader(pt.PodcastTranscriptDownloader):
+    """Two shows whose episodes share GUIDs and titles"""
+
+    def get_podcasts_info(self, podcasts, batch_size=None, use_cache=True):
+        return {podcast_id: {'collectionName': f"Show {podcast_id}",
+                             'feedUrl': f"https://example.com/{podcast_id}.xml"} for podcast_id in podcasts}
+
+    def iter_rss_episodes(self, feed_url, use_cache=True):
+        for guid in ('2', '1'):
+            yield {'guid': guid, 'title': f"Episode {guid}", 'link': '', 'published': '',
+                   'audio_url': None, 'transcripts': []}
+
+
+def test_enqueue_keeps_shows_with_shared_guids_apart(make_queue, tmp_path):
+    queue = make_queue()
+    downloader = TwoShowDownloader(cache_dir=str(tmp_path / "cache"))
+    assert downloader.enqueue_episodes(queue, ['a', 'b'], stream_feed=True) == 4
+    assert downloader.enqueue_episodes(queue, ['a', 'b'], stream_feed=True) == 0
+    assert queue.counts()['pending'] == 4
@@ -0,0 +1,64 @@
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import podcast_transcripts as pt
+
+
+def lookup_response(fake_response, ids, version):
+    results = [{'collectionId': int(podcast_id), 'collectionName': f"Show {podcast_id} v{version}",
+                'feedUrl': f"https://example.com/{podcast_id}.xml"} for podcast_id in ids]
+    return fake_response(200, json.dumps({'resultCount': len(results), 'results': results}).encode())
+
+
+def requested_ids(url):
+    return parse_qs(urlparse(url).query)['id'][0].split(',')
+
+
+def test_stale_lookup_is_served_while_it_refreshes(tmp_path, fake_response):
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path), lookup_ttl=0)
+    downloader.lookup_cache.put('1', {'collectionName': "Show 1 v1"})
+    release = threading.Event()
+    requests = []
+
+    def slow_get(url, **kwargs):
+        requests.append(url)
+        release.wait(5)
+        return lookup_response(fake_response, requested_ids(url), 2)
+
+    downloader.session.get = slow_get
+
+    # Answered from the cache although the refresh has not finished
+    assert downloader.get_podcast_info('1') == {'collectionName': "Show 1 v1"}
+    # A second caller doesn't start another refresh
+    assert downloader.get_podcast_info('1') == {'collectionName': "Show 1 v1"}
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while downloader.lookup_cache.get('1')[1]['collectionName'] != "Show 1 v2":
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert len(requests) == 1
+
+
+def test_ids_are_looked_up_in_batches(tmp_path, fake_response):
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path))
+    requests = []
+
+    def get(url, **kwargs):
+        requests.append(requested_ids(url))
+        # iTunes leaves out ids it doesn't know
+        return lookup_response(fake_response, [i for i in requested_ids(url) if i != '4'], 1)
+
+    downloader.session.get = get
+    podcasts = ['1', 'https://podcasts.apple.com/us/podcast/show/id2', '3', '1', '4', '5']
+    infos = downloader.get_podcasts_info(podcasts, batch_size=2)
+
+    assert requests == [['1', '2'], ['3', '4'], ['5']]
+    assert sorted(infos) == ['1', '2', '3', '5']
+    assert infos['2']['collectionName'] == "Show 2 v1"
+
+    # Resolved ids now come from the cache; only the unknown one is asked again
+    downloader.get_podcasts_info(podcasts, batch_size=2)
+    assert requests[3:] == [['4']]
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import podcast_transcripts as pt
+
+
+class FakeModel:
+    """Stands in for a Whisper model; records overlapping transcriptions"""
+
+    def __init__(self):
+        self.busy = False
+        self.overlaps = 0
+
+
+class FakeBackend(pt.TranscriptionBackend):
+    name = "fake"
+
+    def __init__(self):
+        self.loaded = []
+
+    def load_model(self, model_name):
+        model = FakeModel()
+        self.loaded.append(model)
+        return model
+
+    def transcribe(self, model, audio):
+        if model.busy:
+            model.overlaps += 1
+        model.busy = True
+        time.sleep(0.05)
+        model.busy = False
+        return {'text': audio, 'segments': []}
+
+
+def run_concurrently(registry, backend, workers):
+    def job():
+        model = registry.checkout("base")
+        try:
+            backend.transcribe(model, "audio")
+        finally:
+            registry.checkin("base", model)
+
+    threads = [threading.Thread(target=job) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_callers_never_share_a_model():
+    backend = FakeBackend()
+    registry = pt.WhisperModelRegistry(backend=backend, copies_per_model=3)
+    run_concurrently(registry, backend, 6)
+    assert 1 <= len(backend.loaded) <= 3
+    assert all(model.overlaps == 0 for model in backend.loaded)
+
+
+def test_single_copy_serialises_callers():
+    backend = FakeBackend()
+    registry = pt.WhisperModelRegistry(backend=backend)
+    run_concurrently(registry, backend, 4)
+    assert len(backend.loaded) == 1
+    assert backend.loaded[0].overlaps == 0
+
+
+def test_switching_sizes_evicts_least_recently_used():
+    backend = FakeBackend()
+    registry = pt.WhisperModelRegistry(max_models=1, backend=backend)
+    registry.checkin("base", registry.checkout("base"))
+    registry.checkin("small", registry.checkout("small"))
+    assert registry.loaded_models() == ["small"]
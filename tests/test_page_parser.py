@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+import podcast_transcripts as pt
+
+
+def parse(html, chunk_size=None, head_only=False):
+    parser = pt.TranscriptHTMLParser(head_only=head_only)
+    chunks = [html] if chunk_size is None else [html[i:i + chunk_size] for i in range(0, len(html), chunk_size)]
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.done:
+            break
+    else:
+        parser.close()
+    return parser
+
+
+def json_ld(data):
+    return f'<script type="application/ld+json">{json.dumps(data)}</script>'
+
+
+@pytest.mark.parametrize('chunk_size', [None, 1, 7])
+def test_nested_container_is_read_to_its_own_end(chunk_size):
+    html = ('<body><div class="episode-transcript"><div>Hello</div><p>there <b>world</b></p></div>'
+            '<div>Footer</div></body>')
+    assert parse(html, chunk_size).transcript == "Hello\nthere world"
+
+
+def test_script_and_style_inside_a_container_are_skipped():
+    html = ('<section class="Transcript"><style>p { color: red }</style>Hi'
+            '<script>var x = "<div>";</script> there</section>')
+    assert parse(html).transcript == "Hi there"
+
+
+def test_empty_toggle_container_does_not_count():
+    html = '<div class="transcript-toggle"></div><div id="transcript">Real text</div>'
+    assert parse(html).transcript == "Real text"
+
+
+def test_json_ld_graph():
+    html = json_ld({'@context': 'https://schema.org', '@graph': [
+        {'@type': 'PodcastSeries', 'name': 'Show'},
+        {'@type': 'PodcastEpisode', 'transcript': {'@type': 'Text', 'text': 'From the graph'}},
+    ]})
+    assert parse(html).transcript == "From the graph"
+
+
+@pytest.mark.parametrize('transcript', [['a', 'b'], 42, {'text': ['a']}, '  '])
+def test_json_ld_transcripts_that_are_not_text_are_ignored(transcript):
+    html = json_ld({'transcript': transcript}) + '<div class="transcript">Container text</div>'
+    assert parse(html).transcript == "Container text"
+
+
+def test_scan_stops_once_a_transcript_is_found():
+    parser = pt.TranscriptHTMLParser()
+    parser.feed('<div class="transcript">First</div>')
+    assert parser.done
+    parser.feed('<div class="transcript">Second</div>')
+    assert parser.transcript == "First"
+
+
+def test_head_only_scan_ends_with_the_head():
+    parser = parse('<html><head><title>x</title></head><body><div class="transcript">Body</div></body>',
+                   chunk_size=5, head_only=True)
+    assert parser.done and parser.transcript is None
+
+
+def test_page_with_a_list_transcript_yields_no_transcript(tmp_path, fake_response):
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path))
+    page = f"<html><head>{json_ld({'transcript': ['a', 'b']})}</head><body></body></html>".encode()
+    downloader.session.get = lambda url, **kwargs: fake_response(200, page, {'Content-Type': 'text/html'})
+    assert downloader.check_existing_transcript('https://example.com/episode') is None
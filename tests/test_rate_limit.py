@@ -0,0 +1,74 @@
+import http.server
+import threading
+
+import pytest
+
+import podcast_transcripts as pt
+
+
+def test_bucket_allows_a_burst_then_spaces_requests():
+    limiter = pt.HostRateLimiter(rate=10, burst=2)
+    assert limiter._reserve('a') == 0
+    assert limiter._reserve('a') == 0
+    assert limiter._reserve('a') == pytest.approx(0.1, abs=0.01)
+    # Callers reserve consecutive slots
+    assert limiter._reserve('a') == pytest.approx(0.2, abs=0.01)
+    # Other hosts have their own bucket
+    assert limiter._reserve('b') == 0
+
+
+def test_host_limits_override_the_default():
+    limiter = pt.HostRateLimiter(rate=10, burst=1, host_limits={'slow': (1, 1), 'free': (0, 0)})
+    limiter._reserve('slow')
+    assert limiter._reserve('slow') == pytest.approx(1.0, abs=0.01)
+    assert all(limiter._reserve('free') == 0 for _ in range(5))
+
+
+class ThrottlingHandler(http.server.BaseHTTPRequestHandler):
+    """Answers the first request for /throttled with 429 and Retry-After: 7"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.headers.get('Host').split(':')[0], self.path))
+        throttle = self.path == '/throttled' and not server.throttled
+        server.throttled = server.throttled or throttle
+        self.send_response(429 if throttle else 200)
+        if throttle:
+            self.send_header('Retry-After', '7')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+
+@pytest.fixture
+def throttling_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+    server.requests = []
+    server.throttled = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_retry_after_pauses_only_that_host(throttling_server, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(pt.time, 'sleep', sleeps.append)
+    limiter = pt.HostRateLimiter(rate=100, burst=10)
+    session = pt.RateLimitedSession(limiter)
+    port = throttling_server.server_address[1]
+
+    response = session.get(f"http://127.0.0.1:{port}/throttled")
+    assert response.status_code == 200
+    assert throttling_server.requests == [('127.0.0.1', '/throttled')] * 2
+    assert len(sleeps) == 1 and sleeps[0] == pytest.approx(7, abs=0.5)
+
+    # A different host name is not held back by the pause
+    assert session.get(f"http://localhost:{port}/other").status_code == 200
+    assert len(sleeps) == 1
+    # ... while the throttled one still is
+    assert limiter._reserve('127.0.0.1') > 5
@@ -0,0 +1,129 @@
+import time
+
+import podcast_transcripts as pt
+
+
+class SlowWhisperDownloader(pt.PodcastTranscriptDownloader):
+    """Every episode needs Whisper; each transcription takes 0.5 s"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fetched = []
+        self.transcribed = []
+        self.released = []
+
+    def transcription_available(self):
+        return True
+
+    def fetch_published_transcript(self, transcripts, errors=None):
+        return "published" if transcripts else None
+
+    def check_existing_transcript(self, episode_url, errors=None):
+        return None
+
+    def fetch_audio(self, audio_url):
+        self.fetched.append(audio_url)
+        return audio_url
+
+    def release_audio(self, path):
+        self.released.append(path)
+
+    def transcribe_audio(self, audio, model_name=None):
+        time.sleep(0.5)
+        self.transcribed.append(audio)
+        return f"whisper {audio}"
+
+
+def episodes(count, published_every=()):
+    return [{
+        'title': f"Episode {i}",
+        'guid': f"g{i}",
+        'published': f"Mon, {10 + i:02d} Jan 2024 00:00:00 GMT",
+        'audio_url': f"audio-{i}",
+        'transcripts': [{'url': 'x'}] if i in published_every else [],
+    } for i in range(count)]
+
+
+def test_budget_is_checked_when_transcription_starts(tmp_path):
+    downloader = SlowWhisperDownloader(cache_dir=str(tmp_path / "cache"))
+    state_store = pt.EpisodeStateStore(str(tmp_path / "state.sqlite3"))
+    scheduler = pt.EpisodeScheduler(cpu_budget=0.1)
+
+    successful, failed, skipped = downloader.process_episodes(
+        episodes(8), str(tmp_path / "out"), io_workers=4, cpu_workers=1,
+        state_store=state_store, scheduler=scheduler)
+
+    assert len(downloader.transcribed) == 1
+    assert (successful, failed, skipped) == (1, 7, 0)
+    # Audio downloaded for refused jobs is handed back
+    assert sorted(downloader.released) == sorted(set(downloader.fetched) - set(downloader.transcribed))
+    statuses = {state_store.get(f"g{i}")['status'] for i in range(8)}
+    assert statuses == {'done', 'deferred'}
+    state_store.close()
+
+
+class RecordingScheduler(pt.EpisodeScheduler):
+    """Records the order jobs are handed to the pipeline
+
+    Results of jobs that finish together are handled in any order, so the
+    order of saved transcripts is not a reliable measure.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.popped = []
+
+    def pop(self):
+        job = super().pop()
+        if job is not None:
+            episode_data, whisper = job
+            self.popped.append((episode_data['title'], whisper))
+        return job
+
+
+def test_cheap_and_newest_episodes_go_first(tmp_path):
+    downloader = SlowWhisperDownloader(cache_dir=str(tmp_path / "cache"))
+    downloader.transcribe_audio = lambda audio, model_name=None: f"whisper {audio}"
+    scheduler = RecordingScheduler()
+
+    downloader.process_episodes(episodes(4, published_every={0, 2}), str(tmp_path / "out"),
+                                io_workers=1, scheduler=scheduler)
+
+    assert scheduler.popped == [
+        ("Episode 2", False), ("Episode 0", False), ("Episode 3", False), ("Episode 1", False),
+        ("Episode 3", True), ("Episode 1", True),
+    ]
+
+
+class FeedWhisperDownloader(SlowWhisperDownloader):
+    """SlowWhisperDownloader serving four episodes as a show's feed, newest first"""
+
+    def get_podcast_info(self, podcast_id, use_cache=True):
+        return {'collectionName': 'Show', 'feedUrl': 'https://example.com/feed'}
+
+    def iter_rss_episodes(self, feed_url, use_cache=True):
+        yield from reversed(episodes(4))
+
+
+def sync_with_budget(tmp_path, cpu_budget):
+    downloader = FeedWhisperDownloader(cache_dir=str(tmp_path / "cache"))
+    downloader.download_all_transcripts("https://podcasts.apple.com/us/podcast/x/id1", str(tmp_path / "out"),
+                                        stream_feed=True, incremental=True,
+                                        scheduler=pt.EpisodeScheduler(cpu_budget=cpu_budget))
+    store = pt.EpisodeStateStore(str(tmp_path / "out" / pt.EpisodeStateStore.FILENAME))
+    try:
+        return downloader.transcribed, store.high_water_mark('https://example.com/feed')
+    finally:
+        store.close()
+
+
+def test_high_water_mark_stays_behind_deferred_episodes(tmp_path):
+    first, mark = sync_with_budget(tmp_path, 0.1)
+    # Whichever episode reached Whisper first used up the budget; the
+    # others were deferred, so the feed's mark can't move past them yet
+    assert len(first) == 1
+    assert mark is None
+
+    rest, mark = sync_with_budget(tmp_path, None)
+    assert sorted(first + rest) == ['audio-0', 'audio-1', 'audio-2', 'audio-3']
+    assert mark['guid'] == 'g3'
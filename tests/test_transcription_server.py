@@ -0,0 +1,77 @@
+import http.client
+import threading
+
+import pytest
+
+import podcast_transcripts as pt
+
+np = pytest.importorskip('numpy')
+
+
+class FakeBackend(pt.TranscriptionBackend):
+    name = "fake"
+
+    def __init__(self, label):
+        self.label = label
+        self.calls = 0
+
+    def available(self):
+        return True
+
+    def load_model(self, model_name):
+        return model_name
+
+    def transcribe(self, model, audio):
+        self.calls += 1
+        text = f"{self.label} heard {len(audio)} samples"
+        return {'text': text, 'segments': [{'start': 0.0, 'end': len(audio) / 16000, 'text': text}]}
+
+
+@pytest.fixture
+def server():
+    server = pt.TranscriptionServer(('127.0.0.1', 0), model_name='base', backend=FakeBackend("server"))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, headers, body=b''):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    try:
+        connection.putrequest('POST', '/transcribe')
+        for name, value in headers.items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        return connection.getresponse().status
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize('length', ['abc', '-1'])
+def test_bad_content_length_is_a_bad_request(server, length):
+    assert post(server, {'Content-Type': 'application/octet-stream', 'Content-Length': length}) == 400
+
+
+def test_samples_are_transcribed(server):
+    samples = np.zeros(1600, dtype=np.float32)
+    assert post(server, {'Content-Type': 'application/octet-stream',
+                         'Content-Length': str(samples.nbytes)}, samples.tobytes()) == 200
+
+
+def test_server_results_are_not_served_to_local_runs(server, tmp_path):
+    samples = np.zeros(16000, dtype=np.float32)
+    url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+
+    remote = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path), backend=FakeBackend("local"),
+                                            whisper_model='base', transcription_server=url)
+    result = remote.transcribe_audio_result(samples)
+    assert result == {'text': "server heard 16000 samples", 'segments': []}
+    assert remote.backend.calls == 0
+
+    local = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path), backend=FakeBackend("local"),
+                                           whisper_model='base')
+    result = local.transcribe_audio_result(samples)
+    assert result['text'] == "local heard 16000 samples"
+    assert result['segments']
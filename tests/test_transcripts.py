@@ -0,0 +1,90 @@
+import podcast_transcripts as pt
+
+
+VTT = """WEBVTT
+Kind: captions
+
+NOTE
+This is a comment
+spanning two lines
+
+STYLE
+::cue { color: yellow }
+
+intro
+00:00:00.000 --> 00:00:02.000
+<v Host>Hello
+
+00:00:02.000 --> 00:00:04.000
+NOTE that I said hi
+
+3
+00:00:04.000 --> 00:00:06.000
+NOTE that I said hi
+"""
+
+SRT = """1
+00:00:00,000 --> 00:00:02,000
+Hello &amp; welcome
+
+2
+00:00:02,000 --> 00:00:04,000
+to the show
+"""
+
+
+def test_vtt_cue_ids_and_comment_blocks_are_dropped():
+    assert pt.normalize_transcript(VTT, 'vtt') == 'Hello NOTE that I said hi'
+
+
+def test_vtt_with_bom_and_crlf():
+    assert pt.normalize_transcript('\ufeff' + VTT.replace('\n', '\r\n'), 'vtt') == 'Hello NOTE that I said hi'
+
+
+def test_srt():
+    assert pt.normalize_transcript(SRT, 'srt') == 'Hello & welcome to the show'
+
+
+def fetch(tmp_path, fake_response, content, content_type):
+    downloader = pt.PodcastTranscriptDownloader(cache_dir=str(tmp_path))
+    response = fake_response(200, content, {'Content-Type': content_type})
+    # What requests reports for text/* without a charset
+    response.text = content.decode('iso-8859-1')
+    downloader.session.get = lambda url, **kwargs: response
+    return downloader.fetch_published_transcript([{'url': 'https://example.com/t', 'format': 'text'}])
+
+
+def test_published_transcript_defaults_to_utf8(tmp_path, fake_response):
+    assert fetch(tmp_path, fake_response, 'Café – naïve'.encode('utf-8'), 'text/plain') == 'Café – naïve'
+
+
+def test_published_transcript_honours_declared_charset(tmp_path, fake_response):
+    assert fetch(tmp_path, fake_response, 'Café'.encode('latin-1'), 'text/plain; charset=ISO-8859-1') == 'Café'
+
+
+class OrderRecordingDownloader(pt.PodcastTranscriptDownloader):
+    def __init__(self, *args, found, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.found = found
+        self.calls = []
+
+    def fetch_published_transcript(self, transcripts, errors=None):
+        self.calls.append('published')
+        return 'published' if 'published' in self.found else None
+
+    def check_existing_transcript(self, episode_url, errors=None):
+        self.calls.append('page')
+        return 'page' if 'page' in self.found else None
+
+    def transcribe_audio_with_whisper(self, audio_url):
+        self.calls.append('whisper')
+        return 'whisper'
+
+
+def test_sources_tried_in_order_until_one_has_a_transcript(tmp_path):
+    episode = {'link': 'https://example.com/e', 'audio_url': 'https://example.com/e.mp3', 'transcripts': []}
+    for found, expected in ((('published', 'page'), ['published']), (('page',), ['published', 'page']),
+                            ((), ['published', 'page', 'whisper'])):
+        downloader = OrderRecordingDownloader(cache_dir=str(tmp_path), found=found)
+        assert downloader.fetch_transcript_content(episode) == expected[-1]
+        assert downloader.calls == expected